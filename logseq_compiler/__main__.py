@@ -1,8 +1,43 @@
 import argparse
+import sys
 from pathlib import Path
-from logseq_compiler.compiler import Graph, CompilerError
+from logseq_compiler.compiler import Graph, CompilerError, LAYOUTS, LAYOUT_FLAT
+from logseq_compiler.diff import diff_records, format_diff, read_records
+from logseq_compiler.redirects import REDIRECT_FORMATS
+
+def diff_main(argv) -> None:
+    import json
+    import time
+    t_start = time.time()
+    parser = argparse.ArgumentParser(
+        prog="logseq-compiler diff",
+        description="Compare two Logseq graph JSON exports by block uuid.",
+    )
+    parser.add_argument("old_graph_json_path", help="Path to the older Logseq graph JSON")
+    parser.add_argument("new_graph_json_path", help="Path to the newer Logseq graph JSON")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the diff as JSON ({added, modified, moved, deleted} uuid lists)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        new = read_records(Path(args.new_graph_json_path).expanduser())
+        diff = diff_records(read_records(Path(args.old_graph_json_path).expanduser()), new)
+    except Exception as e:
+        print(f"Error: failed to diff graphs: {e}")
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(diff.to_json(), indent=2))
+        return
+    if not diff.is_empty():
+        print(format_diff(diff, new))
+    print(f"[logseq-compiler] [diff] {diff.summary()}. Time elapsed: {time.time() - t_start:.2f}s")
 
 def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == 'diff':
+        diff_main(sys.argv[2:])
+        return
     import time
     t_compiler_start = time.time()
     parser = argparse.ArgumentParser(
@@ -16,6 +51,72 @@ def main() -> None:
         action="store_true",
         help="Assume public unless block states otherwise (default: off, requires public:: true to be included)",
     )
+    parser.add_argument(
+        "--prune-private",
+        action="store_true",
+        help="Drop private subtrees while loading, keeping only redaction stubs for private blocks that public content sits under or links to",
+    )
+    parser.add_argument(
+        "--inline-embeds",
+        action="store_true",
+        help="Render {{embed}} content into pages at compile time instead of emitting Hugo embed shortcodes",
+    )
+    parser.add_argument(
+        "--embed-depth",
+        type=int,
+        default=5,
+        help="Maximum nesting depth for --inline-embeds; deeper embeds become links (default: 5)",
+    )
+    parser.add_argument(
+        "--related",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Precompute the top K related public pages of each page into front matter (default: 0, off)",
+    )
+    parser.add_argument(
+        "--namespace-index",
+        action="store_true",
+        help="Add public namespace children, depth and counts to namespace pages' front matter",
+    )
+    parser.add_argument(
+        "--redirects",
+        metavar="REDIRECTS_PATH",
+        help="Write all public alias redirects to one file at REDIRECTS_PATH instead of per-page aliases front matter",
+    )
+    parser.add_argument(
+        "--redirects-format",
+        choices=REDIRECT_FORMATS,
+        default="netlify",
+        help="Format of the --redirects file: netlify _redirects, apache, nginx map, or json for a Hugo data file (default: netlify)",
+    )
+    parser.add_argument(
+        "--data-folder",
+        metavar="DATA_PATH",
+        help="Hugo data folder to write index data files into (property indexes under properties/)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=LAYOUTS,
+        default=LAYOUT_FLAT,
+        help="Output layout: 'flat' writes each block at its URL path, 'hashed' fans uuid folders out into hash-prefix subfolders and keeps URLs via front matter (default: flat)",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="OLD_GRAPH_JSON",
+        help="Delta export: update the destination in place, re-rendering only outputs affected by changes since OLD_GRAPH_JSON and removing stale ones (compares both graphs in memory, also with --store)",
+    )
+    parser.add_argument(
+        "--store",
+        metavar="DB_PATH",
+        help="Compile out-of-core using an on-disk SQLite store at DB_PATH (for graphs that don't fit in memory)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=10000,
+        help="Number of blocks kept in the LRU cache when using --store (default: 10000)",
+    )
 
     args = parser.parse_args()
     try:
@@ -23,8 +124,23 @@ def main() -> None:
             json_path=Path(args.graph_json_path).expanduser(),
             assets_folder=Path(args.assets_folder_path).expanduser(),
             destination_folder=Path(args.destination_folder_path).expanduser(),
+            store_path=Path(args.store).expanduser() if args.store else None,
+            cache_size=args.cache_size,
+            prune_private=args.prune_private,
+            assume_public=args.assume_public,
+        )
+        graph.export_for_hugo(
+            assume_public=args.assume_public,
+            inline_embeds=args.inline_embeds,
+            embed_depth=args.embed_depth,
+            data_folder=Path(args.data_folder).expanduser() if args.data_folder else None,
+            layout=args.layout,
+            related_count=args.related,
+            namespace_index=args.namespace_index,
+            redirects_file=Path(args.redirects).expanduser() if args.redirects else None,
+            redirects_format=args.redirects_format,
+            since=Path(args.since).expanduser() if args.since else None,
         )
-        graph.export_for_hugo(assume_public=args.assume_public)
         print("Done!")
     except CompilerError as ce:
         print(f"Error: {ce}")
@@ -96,3 +96,29 @@ class Block:
             inherited_linked_ids=get_id_list(json_obj.get(k['path_refs'], [])),
             alias_ids=get_id_list(json_obj.get(k['alias'], [])),
         )
+
+
+def order_siblings(siblings: List[Any]) -> Dict[int, int]:
+    """
+    Assign a sibling index to each of `siblings` (objects with `id` and `left_id`),
+    following left_id chains and tolerating broken or incomplete chains.
+    """
+    indices: Dict[int, int] = {}
+    left_id_to_block = {b.left_id: b for b in siblings if b.left_id is not None}
+    sibling_ids = {b.id for b in siblings}
+    # Heads: left_id is None or not among sibling ids
+    heads = [b for b in siblings if b.left_id is None or b.left_id not in sibling_ids]
+    idx = 0
+    # Traverse from each head
+    for head in heads:
+        current = head
+        while current and current.id not in indices:
+            indices[current.id] = idx
+            current = left_id_to_block.get(current.id)
+            idx += 1
+    # Orphans: assign index to any unvisited sibling
+    for b in siblings:
+        if b.id not in indices:
+            indices[b.id] = idx
+            idx += 1
+    return indices
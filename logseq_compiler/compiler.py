@@ -1,25 +1,76 @@
 from __future__ import annotations
 
 import json
+from collections import namedtuple
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, Dict, List
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 
-from .block import Block
-from .hugoblock import HugoBlock
+from .block import Block, order_siblings
+from .diff import GraphDiff, diff_graphs
+from .embeds import EmbedRenderer
+from .hugoblock import REDACTED_TEXT, HugoBlock, block_path, content_path, is_home
+from .indexes import NamespaceIndex, PropertyIndex
+from .redirects import REDIRECT_FORMATS, RedirectMap
+from .related import related_pages
+from .store import GraphStore, iter_json_array, public_flag
 
 
 class CompilerError(Exception):
     pass
 
+LAYOUT_FLAT = 'flat'
+LAYOUT_HASHED = 'hashed'
+LAYOUTS = (LAYOUT_FLAT, LAYOUT_HASHED)
+
+_SiblingRow = namedtuple('_SiblingRow', 'id left_id')
+
+ASSET_LINK_PATTERN = re.compile(r'\((?:\.\./)?assets/([^\)]+)\)')
+
 class Graph:
-    def __init__(self, json_path: Path, assets_folder: Path, destination_folder: Path) -> None:
+    def __init__(self, json_path: Path, assets_folder: Path, destination_folder: Path, store_path: Optional[Path] = None, cache_size: int = 10000, prune_private: bool = False, assume_public: bool = False) -> None:
+        self.json_path = json_path
         self.assets_folder = assets_folder
         self.destination_folder = destination_folder
         self.blocks: Dict[int, Block] = {}
         self.block_paths: Dict[int, str] = {}
+        # Position of each block in the graph JSON; link replacement follows this order
+        self.block_positions: Mapping[int, int] = {}
         self.all_content: List[Any] = []  # Placeholder for HugoBlock equivalent
-        self._load_blocks(json_path)
-        self._calculate_block_hierarchies()
+        self.cache_size = cache_size
+        self.store_path = store_path
+        self.prune_private = prune_private
+        self.store: Optional[GraphStore] = None
+        self._children_map: Optional[Dict[Optional[int], List[int]]] = None
+        if store_path is not None:
+            if prune_private:
+                raise CompilerError('Pruning private blocks is not supported with an on-disk store')
+            self._load_store(json_path, store_path, cache_size)
+        elif prune_private:
+            self._load_pruned_blocks(json_path, assume_public)
+            self._calculate_block_hierarchies()
+        else:
+            self._load_blocks(json_path)
+            self._calculate_block_hierarchies()
+
+    def _load_store(self, json_path: Path, store_path: Path, cache_size: int) -> None:
+        # Out-of-core backend: the maps below are dict-like views over an indexed SQLite store
+        try:
+            self.store = GraphStore(store_path, cache_size=cache_size)
+            self.store.ingest(json_path)
+        except Exception as e:
+            print(f"[logseq-compiler] ERROR during block loading: {e}")
+            raise CompilerError(f"Failed to load blocks: {e}")
+        self.blocks = self.store.blocks
+        self.backlinks_map = self.store.backlinks_map
+        self.aliases_map = self.store.aliases_map
+        self.links_map = self.store.links_map
+        self.sibling_index_map = self.store.sibling_index_map
+        self.namespace_children = self.store.namespace_children
+        self.public_registry = self.store.public_registry
+        self.block_paths = self.store.block_paths
+        self.block_positions = self.store.block_positions
 
     def _load_blocks(self, json_path: Path) -> None:
         try:
@@ -36,86 +87,188 @@ class Graph:
                 if 'db/id' in block_json and 'block/uuid' in block_json
             }
             print(f"[logseq-compiler] {len(self.blocks)} valid blocks loaded.")
+            self.block_positions = {block_id: position for position, block_id in enumerate(self.blocks)}
 
-            # Precompute backlinks, aliases, links, and sibling_index for all blocks
-            self.backlinks_map = {block_id: [] for block_id in self.blocks}
-            self.aliases_map = {block_id: [] for block_id in self.blocks}
-            self.links_map = {block_id: [] for block_id in self.blocks}
-            self.sibling_index_map = {}
-            # Build backlinks and links
-            for b in self.blocks.values():
-                for linked_id in getattr(b, 'linked_ids', []):
-                    if linked_id in self.blocks:
-                        self.links_map[b.id].append(linked_id)
-                        self.backlinks_map[linked_id].append(b.id)
-                for alias_id in getattr(b, 'alias_ids', []):
-                    if alias_id in self.blocks:
-                        self.aliases_map[b.id].append(alias_id)
-            # Build sibling_index: for each block, count siblings to the left
+            self._index_blocks()
+        except Exception as e:
+            print(f"[logseq-compiler] ERROR during block loading: {e}")
+            raise CompilerError(f"Failed to load blocks: {e}")
+
+    def _load_pruned_blocks(self, json_path: Path, assume_public: bool) -> None:
+        """
+        Loads only what a public export needs: full blocks for public blocks, and
+        redaction stubs for the private blocks they sit under or link to.
+        """
+        import time
+        try:
+            print(f"[logseq-compiler] [prune] Reading block hierarchy from: {json_path}")
+            t0 = time.time()
+            parents: Dict[int, Optional[int]] = {}
+            lefts: Dict[int, Optional[int]] = {}
+            flags: Dict[int, bool] = {}
+            # Namespace parents, so stubs keep the namespace chains public pages sit in
+            namespaces: Dict[int, int] = {}
+            for block_json in iter_json_array(json_path):
+                if 'db/id' not in block_json or 'block/uuid' not in block_json:
+                    continue
+                block_id = block_json['db/id']
+                parents[block_id] = (block_json.get('block/parent') or {}).get('db/id')
+                lefts[block_id] = (block_json.get('block/left') or {}).get('db/id')
+                flag = public_flag(block_json.get('block/properties') or {})
+                if flag is not None:
+                    flags[block_id] = flag
+                namespace_id = (block_json.get('block/namespace') or {}).get('db/id')
+                if namespace_id is not None:
+                    namespaces[block_id] = namespace_id
+            print(f"[logseq-compiler] [prune] {len(parents)} blocks in hierarchy. Time elapsed: {time.time() - t0:.2f}s")
+
+            # Effective visibility, walking up to the nearest decided ancestor
+            public: Dict[int, bool] = {}
+            for block_id in parents:
+                chain = []
+                current = block_id
+                while current not in public:
+                    if current in flags:
+                        public[current] = flags[current]
+                        break
+                    parent_id = parents.get(current)
+                    if parent_id is None:
+                        public[current] = assume_public
+                        break
+                    if parent_id not in parents:
+                        # Orphaned subtree: unreachable from any page, never exported
+                        public[current] = False
+                        break
+                    chain.append(current)
+                    current = parent_id
+                for child_id in reversed(chain):
+                    public[child_id] = public[parents[child_id]]
+
+            # Sibling order comes from the full hierarchy so weights don't shift when private siblings are dropped
+            parent_to_children: Dict[Optional[int], List[Any]] = {}
+            for block_id, parent_id in parents.items():
+                parent_to_children.setdefault(parent_id, []).append(_SiblingRow(block_id, lefts[block_id]))
+            sibling_index_map = {}
+            for siblings in parent_to_children.values():
+                sibling_index_map.update(order_siblings(siblings))
+            del parent_to_children, lefts
+
+            print("[logseq-compiler] [prune] Loading public blocks...")
+            self.blocks = {}
+            needed = set()
+            for block_json in iter_json_array(json_path):
+                block_id = block_json.get('db/id')
+                if block_id not in parents or not public[block_id]:
+                    continue
+                block = Block.from_json(block_json)
+                self.blocks[block_id] = block
+                needed.update(block.linked_ids)
+                needed.update(block.alias_ids)
+                if block.namespace_id is not None:
+                    needed.add(block.namespace_id)
+                if block.parent_id is not None:
+                    needed.add(block.parent_id)
+            # Stubs also need their ancestors, for paths and for visibility inheritance,
+            # and their namespaces, so private intermediate namespace pages stay connected
+            stub_ids = set()
+            queue = list(needed)
+            while queue:
+                current = queue.pop()
+                while current in parents and current not in self.blocks and current not in stub_ids:
+                    stub_ids.add(current)
+                    if current in namespaces:
+                        queue.append(namespaces[current])
+                    current = parents[current]
+
+            print(f"[logseq-compiler] [prune] Loading {len(stub_ids)} redaction stubs...")
+            if stub_ids:
+                for block_json in iter_json_array(json_path):
+                    block_id = block_json.get('db/id')
+                    if block_id not in stub_ids:
+                        continue
+                    block = Block.from_json(block_json)
+                    # Stubs keep identity and position only; block references to them read as redacted
+                    self.blocks[block_id] = replace(
+                        block,
+                        content=None if block.is_page() else REDACTED_TEXT,
+                        properties={'public': False},
+                        linked_ids=[],
+                        inherited_linked_ids=[],
+                        alias_ids=[],
+                    )
+            positions = {block_id: position for position, block_id in enumerate(parents)}
+            self.block_positions = {block_id: positions[block_id] for block_id in self.blocks}
+            del parents, flags, namespaces, public, positions
+            print(f"[logseq-compiler] [prune] {len(self.blocks) - len(stub_ids)} public blocks and {len(stub_ids)} stubs loaded. Time elapsed: {time.time() - t0:.2f}s")
+
+            self._index_blocks(sibling_index_map={bid: sibling_index_map[bid] for bid in self.blocks})
+        except Exception as e:
+            print(f"[logseq-compiler] ERROR during block loading: {e}")
+            raise CompilerError(f"Failed to load blocks: {e}")
+
+    def _index_blocks(self, sibling_index_map: Optional[Dict[int, int]] = None) -> None:
+        # Precompute backlinks, aliases, links, and sibling_index for all blocks
+        self.backlinks_map = {block_id: [] for block_id in self.blocks}
+        self.aliases_map = {block_id: [] for block_id in self.blocks}
+        self.links_map = {block_id: [] for block_id in self.blocks}
+        self.sibling_index_map = sibling_index_map if sibling_index_map is not None else {}
+        # Namespace tree: namespace page id -> pages directly inside it
+        self.namespace_children = {}
+        # Build backlinks and links
+        for b in self.blocks.values():
+            for linked_id in getattr(b, 'linked_ids', []):
+                if linked_id in self.blocks:
+                    self.links_map[b.id].append(linked_id)
+                    self.backlinks_map[linked_id].append(b.id)
+            for alias_id in getattr(b, 'alias_ids', []):
+                if alias_id in self.blocks:
+                    self.aliases_map[b.id].append(alias_id)
+            if b.namespace_id is not None and b.namespace_id in self.blocks:
+                self.namespace_children.setdefault(b.namespace_id, []).append(b.id)
+        # Build sibling_index: for each block, count siblings to the left
+        if sibling_index_map is None:
             parent_to_children = {}
             for b in self.blocks.values():
                 parent_to_children.setdefault(b.parent_id, []).append(b)
             for siblings in parent_to_children.values():
-                id_to_block = {b.id: b for b in siblings}
-                left_id_to_block = {b.left_id: b for b in siblings if b.left_id is not None}
-                sibling_ids = set(id_to_block)
-                # Heads: left_id is None or not among sibling ids
-                heads = [b for b in siblings if b.left_id is None or b.left_id not in sibling_ids]
-                visited = set()
-                idx = 0
-                # Traverse from each head
-                for head in heads:
-                    current = head
-                    while current and current.id not in visited:
-                        self.sibling_index_map[current.id] = idx
-                        visited.add(current.id)
-                        current = left_id_to_block.get(current.id)
-                        idx += 1
-                # Orphans: assign index to any unvisited sibling
-                for b in siblings:
-                    if b.id not in visited:
-                        self.sibling_index_map[b.id] = idx
-                        idx += 1
-
-            # Compute public_registry once here
-            self.public_registry = {}
-            import time
-            print(f"[logseq-compiler] Computing effective public status for all blocks (optimized DFS)...")
-            visited = set()
-            checked_count = 0
-            start_time = time.time()
-            def compute_effective_public(block_id, parent_public=None):
-                nonlocal checked_count
-                if block_id in visited:
-                    return  # already computed
-                block = self.blocks[block_id]
-                if 'public' in block.properties:
-                    val = block.properties['public']
-                    if isinstance(val, bool):
-                        effective = val
-                    else:
-                        effective = str(val).lower() == 'true'
-                elif parent_public is not None:
-                    effective = parent_public
+                self.sibling_index_map.update(order_siblings(siblings))
+
+        # Compute public_registry once here
+        self.public_registry = {}
+        import time
+        print(f"[logseq-compiler] Computing effective public status for all blocks (optimized DFS)...")
+        visited = set()
+        checked_count = 0
+        start_time = time.time()
+        def compute_effective_public(block_id, parent_public=None):
+            nonlocal checked_count
+            if block_id in visited:
+                return  # already computed
+            block = self.blocks[block_id]
+            if 'public' in block.properties:
+                val = block.properties['public']
+                if isinstance(val, bool):
+                    effective = val
                 else:
-                    effective = False
-                self.public_registry[block_id] = effective
-                visited.add(block_id)
-                checked_count += 1
-                if checked_count % 1000 == 0:
-                    print(f"[logseq-compiler] Checked {checked_count} blocks...")
-                children = [b.id for b in self.blocks.values() if b.parent_id == block_id]
-                for child_id in children:
-                    compute_effective_public(child_id, effective)
-            # Only start DFS from top-level blocks
-            top_level_blocks = [b.id for b in self.blocks.values() if b.parent_id is None]
-            for block_id in top_level_blocks:
-                compute_effective_public(block_id)
-            elapsed = time.time() - start_time
-            print(f"[logseq-compiler] Done computing public status for all blocks. Time elapsed: {elapsed:.2f} seconds.")
-        except Exception as e:
-            print(f"[logseq-compiler] ERROR during block loading: {e}")
-            raise CompilerError(f"Failed to load blocks: {e}")
+                    effective = str(val).lower() == 'true'
+            elif parent_public is not None:
+                effective = parent_public
+            else:
+                effective = False
+            self.public_registry[block_id] = effective
+            visited.add(block_id)
+            checked_count += 1
+            if checked_count % 1000 == 0:
+                print(f"[logseq-compiler] Checked {checked_count} blocks...")
+            children = [b.id for b in self.blocks.values() if b.parent_id == block_id]
+            for child_id in children:
+                compute_effective_public(child_id, effective)
+        # Only start DFS from top-level blocks
+        top_level_blocks = [b.id for b in self.blocks.values() if b.parent_id is None]
+        for block_id in top_level_blocks:
+            compute_effective_public(block_id)
+        elapsed = time.time() - start_time
+        print(f"[logseq-compiler] Done computing public status for all blocks. Time elapsed: {elapsed:.2f} seconds.")
 
     def _calculate_block_hierarchies(self) -> None:
         import time
@@ -140,11 +293,242 @@ class Graph:
         elapsed = time.time() - t0
         print(f"[logseq-compiler] [hierarchies] Finished _calculate_block_hierarchies. Time elapsed: {elapsed:.2f} seconds.")
 
-    def export_for_hugo(self, assume_public: bool = False) -> None:
+    def children_of(self, block_id: Optional[int]) -> List[int]:
+        """
+        Returns the ids of a block's children in sibling order.
+        """
+        if self.store is not None:
+            children = self.store.children(block_id)
+        else:
+            if self._children_map is None:
+                self._children_map = {}
+                for b in self.blocks.values():
+                    self._children_map.setdefault(b.parent_id, []).append(b.id)
+            children = self._children_map.get(block_id, [])
+        return sorted(children, key=lambda bid: self.sibling_index_map.get(bid, 0))
+
+    def _export_registry(self, assume_public: bool) -> Tuple[Mapping[int, bool], Iterable[int], int]:
+        """
+        Effective public status under `assume_public`, and the ids of the blocks to publish.
+        """
+        if self.store is not None:
+            public_registry = self.store.registry(assume_public)
+            publishable_count = self.store.count_publishable(assume_public)
+            publishable_ids = self.store.publishable_ids(assume_public)
+        else:
+            # Efficient single-pass: build parent->children map
+            parent_to_children = {}
+            for b in self.blocks.values():
+                parent_to_children.setdefault(b.parent_id, []).append(b.id)
+            # Use explicit stack for DFS, avoid repeated children lookups
+            registry = {}
+            stack = []
+            # Start with top-level blocks
+            for block_id in [b.id for b in self.blocks.values() if b.parent_id is None]:
+                stack.append((block_id, assume_public))
+            while stack:
+                block_id, parent_public = stack.pop()
+                block = self.blocks[block_id]
+                if 'public' in block.properties:
+                    val = block.properties['public']
+                    if isinstance(val, bool):
+                        effective = val
+                    else:
+                        effective = str(val).lower() == 'true'
+                elif parent_public is not None:
+                    effective = parent_public
+                else:
+                    effective = assume_public
+                registry[block_id] = effective
+                for child_id in parent_to_children.get(block_id, []):
+                    stack.append((child_id, effective))
+            public_registry = registry
+            publishable_ids = [b.id for b in self.blocks.values() if b.showable() and public_registry.get(b.id, False)]
+            publishable_count = len(publishable_ids)
+        return public_registry, publishable_ids, publishable_count
+
+    def _published_outputs(self, publishable_ids: Iterable[int]) -> Dict[str, str]:
+        """
+        uuid -> output path for every block an export writes ('' for the home page, which becomes the root _index.md).
+        """
+        outputs = {}
+        home_written = False
+        for block_id in publishable_ids:
+            block = self.blocks[block_id]
+            if is_home(block):
+                if not home_written:
+                    outputs[block.uuid] = ''
+                    home_written = True
+                continue
+            path = self.block_paths.get(block_id, None)
+            if path:
+                outputs[block.uuid] = path
+        return outputs
+
+    def _render_inputs(self, export_registry: Mapping[int, bool]) -> Dict[str, tuple]:
+        """
+        uuid -> what other outputs can show of a block: its output and link paths,
+        visibility, sibling weight, refs, backlinks (in order), aliases and namespace.
+        """
+        uuids = {block_id: block.uuid for block_id, block in self.blocks.items()}
+        inputs = {}
+        for block_id, block in self.blocks.items():
+            inputs[block.uuid] = (
+                self.block_paths.get(block_id),
+                block_path(block, self.blocks),
+                self.public_registry.get(block_id, False),
+                export_registry.get(block_id, False),
+                self.sibling_index_map.get(block_id, 0),
+                uuids.get(block.parent_id),
+                tuple(uuids.get(bid) for bid in self.links_map.get(block_id, [])),
+                tuple(uuids.get(bid) for bid in self.backlinks_map.get(block_id, [])),
+                tuple(uuids.get(bid) for bid in self.aliases_map.get(block_id, [])),
+                uuids.get(block.namespace_id),
+            )
+        return inputs
+
+    def _dependents(self, block_id: int, namespace_index: bool, aliased_by: Mapping[int, List[int]]) -> Set[int]:
+        """
+        Ids of the blocks whose output shows something of `block_id` (in this graph).
+        """
+        block = self.blocks[block_id]
+        dependents = {block_id}
+        dependents.update(self.backlinks_map.get(block_id, []))
+        dependents.update(self.links_map.get(block_id, []))
+        dependents.update(self.aliases_map.get(block_id, []))
+        dependents.update(aliased_by.get(block_id, []))
+        dependents.update(self.namespace_children.get(block_id, []))
+        if block.namespace_id is not None and block.namespace_id in self.blocks:
+            dependents.add(block.namespace_id)
+        if namespace_index:
+            # Namespace totals count the whole subtree, and depths count the whole chain
+            chain = {block_id}
+            current = block
+            while current.namespace_id is not None and current.namespace_id in self.blocks and current.namespace_id not in chain:
+                chain.add(current.namespace_id)
+                current = self.blocks[current.namespace_id]
+            dependents |= chain
+            queue = list(self.namespace_children.get(block_id, []))
+            while queue:
+                for child_id in self.namespace_children.get(queue.pop(), []):
+                    if child_id not in dependents:
+                        dependents.add(child_id)
+                        queue.append(child_id)
+        return dependents
+
+    def _delta(self, since: Path, assume_public: bool, related: Dict[int, List[int]], related_count: int, inline_embeds: bool, namespace_index: bool) -> Tuple[GraphDiff, Set[int], List[str]]:
+        """
+        Compares this graph with an older export and returns the diff, the ids of
+        the blocks whose output must be re-rendered, and the output paths that
+        no longer exist.
+
+        The comparison keeps per-block maps of both graphs in memory, so it is
+        not out-of-core even when both graphs are loaded into a store.
+        """
+        import time
+        print(f"[logseq-compiler] [delta] Diffing {since} against {self.json_path}...")
+        t0 = time.time()
+        diff = diff_graphs(since, self.json_path)
+        print(f"[logseq-compiler] [delta] {diff.summary()}. Time elapsed: {time.time() - t0:.2f}s")
+        # The old graph is loaded the same way as this one, so both see the same relations
+        old_store_path = self.store_path.with_name(f"{self.store_path.stem}.since{self.store_path.suffix}") if self.store_path is not None else None
+        old = Graph(since, self.assets_folder, self.destination_folder, store_path=old_store_path, cache_size=self.cache_size, prune_private=self.prune_private, assume_public=assume_public)
+        # Each registry is built once; with --store, publishable ids are a one-shot query
+        old_registry, old_publishable_ids, _ = old._export_registry(assume_public)
+        new_registry, new_publishable_ids, _ = self._export_registry(assume_public)
+        old_outputs = old._published_outputs(old_publishable_ids)
+        new_outputs = self._published_outputs(new_publishable_ids)
+        deleted_paths = sorted(set(old_outputs.values()) - set(new_outputs.values()))
+
+        ids = {b.uuid: b.id for b in self.blocks.values()}
+        old_ids = {b.uuid: b.id for b in old.blocks.values()}
+        old_uuids = {block_id: uuid for uuid, block_id in old_ids.items()}
+
+        # Blocks whose own output, or what others show of them, changes
+        seeds = set(diff.changed()) | set(diff.deleted)
+        seeds.update(uuid for uuid, path in new_outputs.items() if old_outputs.get(uuid) != path)
+        seeds.update(uuid for uuid in old_outputs if uuid not in new_outputs)
+        old_inputs = old._render_inputs(old_registry)
+        new_inputs = self._render_inputs(new_registry)
+        seeds.update(uuid for uuid, inputs in new_inputs.items() if old_inputs.get(uuid) != inputs)
+        seeds.update(uuid for uuid in old_inputs if uuid not in new_inputs)
+        del old_inputs, new_inputs
+
+        def inverse(aliases_map: Mapping[int, List[int]]) -> Dict[int, List[int]]:
+            aliased_by: Dict[int, List[int]] = {}
+            for block_id, alias_ids in aliases_map.items():
+                for alias_id in alias_ids:
+                    aliased_by.setdefault(alias_id, []).append(block_id)
+            return aliased_by
+
+        aliased_by = inverse(self.aliases_map)
+        old_aliased_by = inverse(old.aliases_map)
+        affected: Set[int] = set()
+        # Parents, old and new, of changed blocks: an inlined embed of an ancestor shows them
+        embed_roots: Set[int] = set()
+        for uuid in seeds:
+            block_id = ids.get(uuid)
+            if block_id is not None:
+                affected.update(self._dependents(block_id, namespace_index, aliased_by))
+                parent_id = self.blocks[block_id].parent_id
+                if parent_id is not None and parent_id in self.blocks:
+                    embed_roots.add(parent_id)
+            old_id = old_ids.get(uuid)
+            if old_id is not None:
+                # Relations that existed only in the old graph (e.g. backlinks from a deleted block, a renamed namespace)
+                old_related_ids = old._dependents(old_id, namespace_index, old_aliased_by)
+                old_parent_id = old.blocks[old_id].parent_id
+                for related_id in old_related_ids | {old_parent_id}:
+                    new_id = ids.get(old_uuids.get(related_id))
+                    if new_id is not None:
+                        if related_id == old_parent_id:
+                            embed_roots.add(new_id)
+                        else:
+                            affected.add(new_id)
+
+        if inline_embeds:
+            # An inlined embed shows the target's whole subtree, and embeds nest, so any
+            # block referencing an affected block or one of its ancestors is affected too
+            queue = list(affected | embed_roots)
+            seen = set(queue)
+            while queue:
+                block = self.blocks.get(queue.pop())
+                while block is not None:
+                    for backlink_id in self.backlinks_map.get(block.id, []):
+                        affected.add(backlink_id)
+                        if backlink_id not in seen:
+                            seen.add(backlink_id)
+                            queue.append(backlink_id)
+                    block = self.blocks.get(block.parent_id) if block.parent_id else None
+
+        if related_count > 0:
+            old_related = related_pages(old.blocks, old_registry, top_k=related_count)
+            # Compare the paths pages show, so renamed related pages count as a change
+            for uuid in new_outputs:
+                block_id = ids[uuid]
+                old_id = old_ids.get(uuid)
+                new_list = [block_path(self.blocks[r], self.blocks) for r in related.get(block_id, []) if r in self.blocks]
+                old_list = [block_path(old.blocks[r], old.blocks) for r in old_related.get(old_id, []) if r in old.blocks] if old_id is not None else []
+                if new_list != old_list:
+                    affected.add(block_id)
+        print(f"[logseq-compiler] [delta] {len(seeds)} changed blocks, {len(affected)} outputs to re-render, {len(deleted_paths)} to delete. Time elapsed: {time.time() - t0:.2f}s")
+        return diff, affected, deleted_paths
+
+    def export_for_hugo(self, assume_public: bool = False, inline_embeds: bool = False, embed_depth: int = 5, data_folder: Optional[Path] = None, layout: str = LAYOUT_FLAT, related_count: int = 0, namespace_index: bool = False, redirects_file: Optional[Path] = None, redirects_format: str = 'netlify', since: Optional[Path] = None) -> List[str]:
+        """
+        Writes the Hugo content tree. With `since` (an older graph.json export), only
+        outputs affected by the changes are re-rendered and stale outputs are removed;
+        the removed output paths are returned.
+        """
         import shutil
         import time
         from pathlib import Path
         print("[logseq-compiler] [export] Starting export_for_hugo...")
+        if layout not in LAYOUTS:
+            raise CompilerError(f"Unknown layout '{layout}', expected one of: {', '.join(LAYOUTS)}")
+        hashed = layout == LAYOUT_HASHED
+        if redirects_format not in REDIRECT_FORMATS:
+            raise CompilerError(f"Unknown redirects format '{redirects_format}', expected one of: {', '.join(REDIRECT_FORMATS)}")
         t_process_start = time.time()
 
         def is_public(block: Block) -> bool:
@@ -153,86 +537,30 @@ class Graph:
                 return not (str(props.get('public', 'true')).lower() == 'false')
             return str(props.get('public', 'false')).lower() == 'true'
 
-        # Prepare destination: remove all except /files
-        print("[logseq-compiler] [export] Preparing destination folder (deleting old content)...")
-        t_prep = time.time()
-        items = list(self.destination_folder.iterdir())
-        print(f"[logseq-compiler] [export] Found {len(items)} items in destination folder.")
-        deleted = 0
-        for item in items:
-            if item.name == 'files':
-                continue
-            if item.is_dir():
-                shutil.rmtree(item)
-            else:
-                item.unlink()
-            deleted += 1
-            if deleted % 100 == 0:
-                print(f"[logseq-compiler] [export] Deleted {deleted} items...")
-        print(f"[logseq-compiler] [export] Done preparing destination. Deleted {deleted} items. Time elapsed: {time.time() - t_prep:.2f}s")
-
-        print("[logseq-compiler] [export] ENTER: Building all_content as HugoBlock objects...")
-        t_allcontent = time.time()
-        all_content = [
-            HugoBlock(
-                block,
-                self.blocks,
-                backlinks=self.backlinks_map.get(block.id, []),
-                aliases=self.aliases_map.get(block.id, []),
-                links=self.links_map.get(block.id, []),
-                sibling_index=self.sibling_index_map.get(block.id, 0)
-            )
-            for block in self.blocks.values() if block.showable()
-        ]
-        print(f"[logseq-compiler] [export] EXIT: Built all_content. Time elapsed: {time.time() - t_allcontent:.2f}s")
+        # Prepare destination: remove all except /files (a delta export updates it in place instead)
+        if since is None:
+            print("[logseq-compiler] [export] Preparing destination folder (deleting old content)...")
+            t_prep = time.time()
+            items = list(self.destination_folder.iterdir())
+            print(f"[logseq-compiler] [export] Found {len(items)} items in destination folder.")
+            deleted = 0
+            for item in items:
+                if item.name == 'files':
+                    continue
+                if item.is_dir():
+                    shutil.rmtree(item)
+                else:
+                    item.unlink()
+                deleted += 1
+                if deleted % 100 == 0:
+                    print(f"[logseq-compiler] [export] Deleted {deleted} items...")
+            print(f"[logseq-compiler] [export] Done preparing destination. Deleted {deleted} items. Time elapsed: {time.time() - t_prep:.2f}s")
 
         print("[logseq-compiler] [export] ENTER: Building effective public_registry...")
         t_pubreg = time.time()
-        # Efficient single-pass: build parent->children map
-        parent_to_children = {}
-        for b in self.blocks.values():
-            parent_to_children.setdefault(b.parent_id, []).append(b.id)
-        # Use explicit stack for DFS, avoid repeated children lookups
-        registry = {}
-        stack = []
-        # Start with top-level blocks
-        for block_id in [b.id for b in self.blocks.values() if b.parent_id is None]:
-            stack.append((block_id, assume_public))
-        while stack:
-            block_id, parent_public = stack.pop()
-            block = self.blocks[block_id]
-            if 'public' in block.properties:
-                val = block.properties['public']
-                if isinstance(val, bool):
-                    effective = val
-                else:
-                    effective = str(val).lower() == 'true'
-            elif parent_public is not None:
-                effective = parent_public
-            else:
-                effective = assume_public
-            registry[block_id] = effective
-            for child_id in parent_to_children.get(block_id, []):
-                stack.append((child_id, effective))
-        public_registry = registry
+        public_registry, publishable_ids, publishable_count = self._export_registry(assume_public)
         print(f"[logseq-compiler] [export] EXIT: Built effective public_registry. Time elapsed: {time.time() - t_pubreg:.2f}s")
-
-        print("[logseq-compiler] [export] ENTER: Filtering publishable (public) content...")
-        t_filter = time.time()
-        publishable_content = [hb for hb in all_content if public_registry.get(hb.block.id, False)]
-        print(f"[logseq-compiler] [export] Found {len(publishable_content)} publishable blocks/pages.")
-        print(f"[logseq-compiler] [export] EXIT: Filtering publishable content. Time elapsed: {time.time() - t_filter:.2f}s")
-
-        print("[logseq-compiler] [export] ENTER: Exporting home page...")
-        t_home = time.time()
-        home_page = next((hb for hb in publishable_content if hb.is_home()), None)
-        if home_page:
-            dir_path = self.destination_folder
-            dir_path.mkdir(parents=True, exist_ok=True)
-            file_path = dir_path / '_index.md'
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(home_page.file(public_registry=self.public_registry))
-        print(f"[logseq-compiler] [export] EXIT: Done exporting home page. Time elapsed: {time.time() - t_home:.2f}s")
+        print(f"[logseq-compiler] [export] Found {publishable_count} publishable blocks/pages.")
 
         print("[logseq-compiler] [export] ENTER: Preparing notes_folder for export...")
         t_notes = time.time()
@@ -240,27 +568,147 @@ class Graph:
         notes_folder.mkdir(parents=True, exist_ok=True)
         print(f"[logseq-compiler] [export] EXIT: notes_folder ready. Time elapsed: {time.time() - t_notes:.2f}s")
 
-        print(f"[logseq-compiler] [export] ENTER: Exporting {len(publishable_content)} pages/blocks...")
+        related = {}
+        if related_count > 0:
+            print(f"[logseq-compiler] [export] ENTER: Computing top {related_count} related pages...")
+            t_related = time.time()
+            related = related_pages(self.blocks, public_registry, top_k=related_count)
+            print(f"[logseq-compiler] [export] EXIT: Computed related pages for {len(related)} pages. Time elapsed: {time.time() - t_related:.2f}s")
+
+        affected = None
+        deleted_paths: List[str] = []
+        if since is not None:
+            print(f"[logseq-compiler] [export] ENTER: Computing delta since {since}...")
+            t_delta = time.time()
+            _, affected, deleted_paths = self._delta(since, assume_public, related, related_count, inline_embeds, namespace_index)
+            print(f"[logseq-compiler] [export] EXIT: Computed delta. Time elapsed: {time.time() - t_delta:.2f}s")
+
+        embeds = None
+        if inline_embeds:
+            embeds = EmbedRenderer(
+                self.blocks,
+                self.links_map,
+                self.children_of,
+                public_registry,
+                max_depth=embed_depth,
+                cache_size=self.cache_size,
+                positions=self.block_positions,
+                title_registry=self.public_registry,
+                hashed=hashed,
+            )
+
+        # Indexes are filled in the export pass and written as Hugo data files
+        property_index = PropertyIndex() if data_folder is not None else None
+        # With a redirects file, aliases go into one redirect map instead of each page's front matter
+        redirects = RedirectMap() if redirects_file is not None else None
+        namespaces = NamespaceIndex(self.blocks, self.namespace_children, public_registry, title_registry=self.public_registry, hashed=hashed) if namespace_index else None
+
+        # HugoBlocks are built one at a time while writing, so memory does not grow with the graph
+        print(f"[logseq-compiler] [export] ENTER: Exporting {publishable_count} pages/blocks...")
         t_pages = time.time()
-        for i, hb in enumerate(publishable_content):
-            if hb.is_home():
-                continue
-            path = self.block_paths.get(hb.block.id, None)
-            if not path:
+        home_written = False
+        referenced_asset_names = set()
+        image_props = []
+        rendered = 0
+        for i, block_id in enumerate(publishable_ids):
+            block = self.blocks[block_id]
+            # Collect asset references from public content and 'image' properties of public pages (no asset x block scan)
+            referenced_asset_names.update(ASSET_LINK_PATTERN.findall(block.content or ''))
+            if block.is_page():
+                image_prop = (block.properties or {}).get('image')
+                if isinstance(image_prop, str):
+                    image_props.append(image_prop)
+            if is_home(block):
+                # The first public home page becomes the site's _index.md
+                if home_written:
+                    continue
+                home_written = True
+                # Same relative form as every other path; the site root is ''
+                path, block_dir, url = '', self.destination_folder, None
+            else:
+                path = self.block_paths.get(block.id, None)
+                if not path:
+                    continue
+                # Hashed layout: write under hash-prefix folders, keep the flat path as the permalink
+                dir_path = content_path(path, hashed)
+                block_dir = self.destination_folder / dir_path
+                url = f"/{path}/" if dir_path != path else None
+            aliases = self.aliases_map.get(block.id, [])
+            if redirects is not None:
+                redirects.add([block_path(self.blocks[alias_id], self.blocks) for alias_id in aliases], path)
+                if block.is_page():
+                    # Only page URLs can collide with alias (page) URLs
+                    redirects.add_page(path)
+                aliases = []
+            if property_index is not None:
+                # Index entries are looked up with site.GetPage, so they hold the content path
+                property_index.add(block, content_path(path, hashed))
+            # Delta export: indexes above still see every public block, but only affected ones are re-rendered
+            if affected is not None and block_id not in affected:
                 continue
+            hb = HugoBlock(
+                block,
+                self.blocks,
+                backlinks=self.backlinks_map.get(block.id, []),
+                aliases=aliases,
+                links=self.links_map.get(block.id, []),
+                sibling_index=self.sibling_index_map.get(block.id, 0),
+                url=url,
+                related=related.get(block.id),
+                namespace_properties=namespaces.properties(block) if namespaces is not None else None,
+                positions=self.block_positions,
+                hashed=hashed,
+            )
             # For both pages and blocks: create a folder and write _index.md
-            block_dir = self.destination_folder / path
             block_dir.mkdir(parents=True, exist_ok=True)
             file_path = block_dir / '_index.md'
             with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(hb.file(public_registry=self.public_registry))
+                f.write(hb.file(public_registry=self.public_registry, embeds=embeds))
+            rendered += 1
             if (i+1) % 500 == 0:
                 print(f"[logseq-compiler] [export] Exported {i+1} pages/blocks...")
+        print(f"[logseq-compiler] [export] Rendered {rendered} pages/blocks.")
+        if embeds is not None and embeds.summary():
+            print(f"[logseq-compiler] [export] {embeds.summary()}")
         print(f"[logseq-compiler] [export] EXIT: Done exporting pages/blocks. Time elapsed: {time.time() - t_pages:.2f}s")
 
+        if deleted_paths:
+            print(f"[logseq-compiler] [export] ENTER: Removing {len(deleted_paths)} stale outputs...")
+            t_stale = time.time()
+            for path in deleted_paths:
+                if path:
+                    block_dir = self.destination_folder / content_path(path, hashed)
+                else:
+                    block_dir = self.destination_folder
+                file_path = block_dir / '_index.md'
+                if file_path.exists():
+                    file_path.unlink()
+                print(f"[logseq-compiler] [export] Removed stale output: {path or '/'}")
+                # Drop folders left empty, up to the content root
+                while block_dir != self.destination_folder and block_dir.exists() and not any(block_dir.iterdir()):
+                    block_dir.rmdir()
+                    block_dir = block_dir.parent
+            print(f"[logseq-compiler] [export] EXIT: Done removing stale outputs. Time elapsed: {time.time() - t_stale:.2f}s")
+
+        if data_folder is not None:
+            print("[logseq-compiler] [export] ENTER: Writing index data files...")
+            t_data = time.time()
+            written = property_index.write(data_folder)
+            print(f"[logseq-compiler] [export] Wrote {written} property index files to {data_folder / 'properties'}.")
+            print(f"[logseq-compiler] [export] EXIT: Done writing index data files. Time elapsed: {time.time() - t_data:.2f}s")
+
+        if redirects is not None:
+            print("[logseq-compiler] [export] ENTER: Writing alias redirects...")
+            t_redirects = time.time()
+            written = redirects.write(redirects_file, redirects_format)
+            for alias, existing, target in redirects.conflicts:
+                print(f"[logseq-compiler] [export] WARNING: Alias {alias} conflicts: {existing} vs {target}; keeping {existing}.")
+            print(f"[logseq-compiler] [export] Wrote {written} redirects ({len(redirects.conflicts)} conflicts) to {redirects_file}.")
+            print(f"[logseq-compiler] [export] EXIT: Done writing alias redirects. Time elapsed: {time.time() - t_redirects:.2f}s")
+
         print("[logseq-compiler] [export] ENTER: Copying referenced assets...")
         t_assets = time.time()
-        # Asset copying logic: copy only assets referenced by public blocks or as the 'image' property of a public page (no regex)
+        # Asset copying logic: copy only assets referenced by public blocks or as the 'image' property of a public page
         assets_src = self.assets_folder
         assets_dst = self.destination_folder / 'assets'
         referenced_assets = []
@@ -269,31 +717,21 @@ class Graph:
             for asset in assets_src.iterdir():
                 if not asset.is_file():
                     continue
-                referenced = False
-                asset_patterns = [f'(assets/{asset.name})', f'(../assets/{asset.name})']
-                # Check if referenced in content of any public block
-                for hb in publishable_content:
-                    content = hb.block.content or ''
-                    if any(pat in content for pat in asset_patterns):
-                        referenced = True
-                        break
-                # Also check if referenced as the 'image' property of any public page
-                if not referenced:
-                    for hb in publishable_content:
-                        block = hb.block
-                        if block.is_page():
-                            image_prop = (block.properties or {}).get('image')
-                            if isinstance(image_prop, str) and image_prop.endswith(asset.name):
-                                referenced = True
-                                break
-                if referenced:
+                if asset.name in referenced_asset_names or any(image_prop.endswith(asset.name) for image_prop in image_props):
                     referenced_assets.append(asset)
             print(f"[logseq-compiler] [export] Found {len(referenced_assets)} public assets to copy.")
             for asset in referenced_assets:
-                shutil.copy2(asset, assets_dst / asset.name)
+                target = assets_dst / asset.name
+                if since is not None and target.exists():
+                    # Delta export: keep copies that are already up to date
+                    src_stat, dst_stat = asset.stat(), target.stat()
+                    if src_stat.st_size == dst_stat.st_size and int(src_stat.st_mtime) == int(dst_stat.st_mtime):
+                        continue
+                shutil.copy2(asset, target)
         print(f"[logseq-compiler] [export] EXIT: Done copying referenced assets. Time elapsed: {time.time() - t_assets:.2f}s")
 
         print(f"[logseq-compiler] [export] DONE. Total export_for_hugo time elapsed: {time.time() - t_process_start:.2f}s")
+        return deleted_paths
 
 def path_component(block: Block) -> str:
     return block.name or block.original_name or str(block.id)
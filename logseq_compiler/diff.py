@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import namedtuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .store import iter_json_array
+
+# Fields whose change makes a block "modified"; position changes make it "moved" instead
+FINGERPRINT_KEYS = (
+    'block/content',
+    'block/properties',
+    'block/name',
+    'block/original-name',
+    'block/format',
+    'block/collapsed?',
+    'block/pre-block?',
+)
+
+BlockRecord = namedtuple('BlockRecord', 'uuid fingerprint updated_at parent_uuid left_uuid page_uuid')
+
+
+def fingerprint(block_json: Dict[str, Any]) -> str:
+    payload = json.dumps([block_json.get(key) for key in FINGERPRINT_KEYS], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def read_records(json_path: Path) -> Dict[str, BlockRecord]:
+    """
+    Streams a graph.json export into uuid -> BlockRecord, resolving parent/left/page
+    db ids to uuids (db ids are not stable across exports).
+    """
+    uuids: Dict[int, str] = {}
+    raw = []
+    for block_json in iter_json_array(json_path):
+        if 'db/id' not in block_json or 'block/uuid' not in block_json:
+            continue
+        uuids[block_json['db/id']] = block_json['block/uuid']
+        raw.append((
+            block_json['block/uuid'],
+            fingerprint(block_json),
+            block_json.get('block/updated-at'),
+            (block_json.get('block/parent') or {}).get('db/id'),
+            (block_json.get('block/left') or {}).get('db/id'),
+            (block_json.get('block/page') or {}).get('db/id'),
+        ))
+    return {
+        uuid: BlockRecord(uuid, fp, updated_at, uuids.get(parent_id), uuids.get(left_id), uuids.get(page_id))
+        for uuid, fp, updated_at, parent_id, left_id, page_id in raw
+    }
+
+
+@dataclass
+class GraphDiff:
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    moved: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+    def changed(self) -> List[str]:
+        """
+        uuids present in the new export whose own output may differ.
+        """
+        modified = set(self.modified)
+        return self.added + self.modified + [uuid for uuid in self.moved if uuid not in modified]
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.moved or self.deleted)
+
+    def summary(self) -> str:
+        return f"{len(self.added)} added, {len(self.modified)} modified, {len(self.moved)} moved, {len(self.deleted)} deleted"
+
+    def to_json(self) -> Dict[str, List[str]]:
+        return {'added': self.added, 'modified': self.modified, 'moved': self.moved, 'deleted': self.deleted}
+
+
+def diff_records(old: Dict[str, BlockRecord], new: Dict[str, BlockRecord]) -> GraphDiff:
+    diff = GraphDiff()
+    for uuid, record in new.items():
+        previous = old.get(uuid)
+        if previous is None:
+            diff.added.append(uuid)
+            continue
+        # The fingerprint decides; updated_at alone (e.g. a re-save) does not make a block modified
+        if previous.fingerprint != record.fingerprint:
+            diff.modified.append(uuid)
+        if (previous.parent_uuid, previous.left_uuid, previous.page_uuid) != (record.parent_uuid, record.left_uuid, record.page_uuid):
+            diff.moved.append(uuid)
+    diff.deleted = [uuid for uuid in old if uuid not in new]
+    return diff
+
+
+def diff_graphs(old_json_path: Path, new_json_path: Path) -> GraphDiff:
+    return diff_records(read_records(old_json_path), read_records(new_json_path))
+
+
+def format_diff(diff: GraphDiff, new: Optional[Dict[str, BlockRecord]] = None) -> str:
+    lines = []
+    for marker, uuids in (('A', diff.added), ('M', diff.modified), ('R', diff.moved), ('D', diff.deleted)):
+        for uuid in uuids:
+            updated_at = new[uuid].updated_at if new is not None and uuid in new else None
+            lines.append(f"{marker} {uuid}" + (f" {updated_at}" if updated_at is not None else ''))
+    return '\n'.join(lines)
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .block import Block
+from .hugoblock import (
+    REDACTED_TEXT,
+    block_path,
+    get_display_text,
+    update_asset_links,
+    update_block_properties,
+    update_links,
+    update_shortcodes,
+)
+
+BLOCK_EMBED_PATTERN = re.compile(r'\{\{embed\s*\(\(\s*([0-9a-fA-F-]+)\s*\)\)\s*\}\}')
+PAGE_EMBED_PATTERN = re.compile(r'\{\{embed\s*\[\[\s*(.*?)\s*\]\]\s*\}\}')
+
+# (markdown, complete, height): complete is False when a cycle or the depth limit cut the render
+Rendered = Tuple[str, bool, int]
+
+# Stands in for a rendered embed while the embedding block's own links are replaced
+PLACEHOLDER = '\x00embed{}\x00'
+# Spaces after an embed are dropped, as text there moves to a line of its own
+PLACEHOLDER_PATTERN = re.compile(r'\x00embed(\d+)\x00[ \t]*')
+
+
+class EmbedRenderer:
+    """
+    Inlines `{{embed ((uuid))}}` and `{{embed [[page]]}}` at compile time instead of
+    leaving them for Hugo's embed shortcodes.
+
+    Each embedded subtree is rendered once and memoized. Private targets render as
+    redacted text. An embed that would repeat a block already on the current
+    embed chain, or nest deeper than `max_depth`, becomes a plain link instead.
+
+    Embeds are swapped for placeholders while the embedding block's links are
+    replaced, so a subtree renders the same wherever it is embedded.
+    """
+
+    def __init__(
+        self,
+        blocks: Mapping[int, Block],
+        links_map: Mapping[int, List[int]],
+        children: Callable[[int], List[int]],
+        public_registry: Mapping[int, bool],
+        max_depth: int = 5,
+        cache_size: int = 10000,
+        positions: Optional[Mapping[int, int]] = None,
+        title_registry: Optional[Mapping[int, bool]] = None,
+        hashed: bool = False,
+    ) -> None:
+        self.blocks = blocks
+        self.links_map = links_map
+        self.children = children
+        # public_registry decides what is inlined; title_registry what link texts show, as in HugoBlock
+        self.public_registry = public_registry
+        self.title_registry = title_registry if title_registry is not None else public_registry
+        self.max_depth = max_depth
+        self.cache_size = cache_size
+        self.positions = positions
+        self.hashed = hashed
+        self._memo: OrderedDict = OrderedDict()
+        self.cycles = 0
+        self.truncated = 0
+
+    def extract(self, block: Block, content: str) -> Tuple[str, List[str]]:
+        """
+        Renders the embeds in `content` and replaces them with placeholders; `fill` puts them back.
+        """
+        content, rendered, _, _ = self._extract(block, content, (block.id,), 0)
+        return content, rendered
+
+    @staticmethod
+    def fill(content: str, rendered: List[str]) -> str:
+        if not rendered:
+            return content
+        return PLACEHOLDER_PATTERN.sub(lambda m: rendered[int(m.group(1))], content)
+
+    def _extract(self, block: Block, content: str, stack: Tuple[int, ...], depth: int) -> Tuple[str, List[str], bool, int]:
+        rendered: List[str] = []
+        if '{{embed' not in content:
+            return content, rendered, True, 0
+        targets = self._embed_targets(block)
+        complete = True
+        height = 0
+
+        def replace(m: re.Match, is_page: bool) -> str:
+            nonlocal complete, height
+            key = m.group(1).lower()
+            target_id = targets.get(('page' if is_page else 'block', key))
+            if target_id is None:
+                return m.group(0)
+            text, target_complete, target_height = self._embed(target_id, is_page, stack, depth + 1)
+            complete = complete and target_complete
+            height = max(height, target_height)
+            # Embedded content is block-level markdown, so start it on its own line, and
+            # end it with a blank line if text follows, so that text does not join its last item
+            prefix = '' if m.start() == 0 or m.string[m.start() - 1] == '\n' else '\n'
+            suffix = '\n\n' if m.string[m.end():].split('\n', 1)[0].strip() else ''
+            rendered.append(prefix + text + suffix)
+            return PLACEHOLDER.format(len(rendered) - 1)
+
+        content = BLOCK_EMBED_PATTERN.sub(lambda m: replace(m, False), content)
+        content = PAGE_EMBED_PATTERN.sub(lambda m: replace(m, True), content)
+        return content, rendered, complete, height
+
+    def _embed_targets(self, block: Block) -> Dict[Tuple[str, str], int]:
+        # Embed targets are always among the block's refs
+        targets = {}
+        for bid in self.links_map.get(block.id, []):
+            b = self.blocks.get(bid)
+            if b is None:
+                continue
+            if b.is_page():
+                for name in (b.name, b.original_name):
+                    if name:
+                        targets[('page', name.lower())] = bid
+            else:
+                targets[('block', b.uuid.lower())] = bid
+        return targets
+
+    def _embed(self, target_id: int, is_page: bool, stack: Tuple[int, ...], depth: int) -> Rendered:
+        target = self.blocks[target_id]
+        if not self.public_registry.get(target_id, False):
+            return REDACTED_TEXT, True, 0
+        if target_id in stack:
+            self.cycles += 1
+            print(f"[logseq-compiler] [embeds] Embed cycle at {target.uuid}, linking instead of inlining.")
+            return self._link(target), False, 0
+        if depth > self.max_depth:
+            self.truncated += 1
+            return self._link(target), False, 0
+        memo = self._memo.get(target_id)
+        # A complete render does not depend on where it is embedded, as long as it still fits the depth limit
+        if memo is not None and depth + memo[2] - 1 <= self.max_depth:
+            self._memo.move_to_end(target_id)
+            return memo
+        if is_page:
+            rendered = self._render_children(target_id, stack + (target_id,), depth)
+        else:
+            rendered = self._render_block(target, stack, depth)
+        text, complete, height = rendered
+        rendered = (text, complete, height + 1)
+        if complete:
+            self._memo[target_id] = rendered
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return rendered
+
+    def _render_block(self, block: Block, stack: Tuple[int, ...], depth: int) -> Rendered:
+        if not self.public_registry.get(block.id, False):
+            return f"- {REDACTED_TEXT}", True, 0
+        stack = stack + (block.id,)
+        content, complete, height = self._content(block, stack, depth)
+        lines = content.split('\n')
+        # A block that starts with an embed gets an empty item, with the embed nested under it
+        out = ['- ' + lines[0] if lines[0] else '-'] + ['  ' + line for line in lines[1:]]
+        children, children_complete, children_height = self._render_children(block.id, stack, depth)
+        if children:
+            out.extend('  ' + line for line in children.split('\n'))
+        return '\n'.join(out), complete and children_complete, max(height, children_height)
+
+    def _render_children(self, block_id: int, stack: Tuple[int, ...], depth: int) -> Rendered:
+        out = []
+        complete = True
+        height = 0
+        for child_id in self.children(block_id):
+            child = self.blocks.get(child_id)
+            if child is None or not child.showable():
+                continue
+            text, child_complete, child_height = self._render_block(child, stack, depth)
+            out.append(text)
+            complete = complete and child_complete
+            height = max(height, child_height)
+        return '\n'.join(out), complete, height
+
+    def _content(self, block: Block, stack: Tuple[int, ...], depth: int) -> Rendered:
+        # Same transformations as HugoBlock.file, with nested embeds filled in after this block's links
+        content = update_asset_links(block.content or '')
+        content, rendered, complete, height = self._extract(block, content, stack, depth)
+        link_paths = {bid: block_path(self.blocks[bid], self.blocks) for bid in self.links_map.get(block.id, []) if bid in self.blocks}
+        content = update_links(content, link_paths, self.blocks, public_registry=self.title_registry, positions=self.positions, hashed=self.hashed)
+        content = update_shortcodes(content)
+        content = update_block_properties(content)
+        if content.startswith(PLACEHOLDER.format(0)):
+            content = '\n' + content
+        return self.fill(content, rendered), complete, height
+
+    def _link(self, block: Block) -> str:
+        text = get_display_text(block, self.blocks, self.title_registry)
+        # The title of an embedding block would otherwise carry its own embed macro into the link text
+        text = PAGE_EMBED_PATTERN.sub('', BLOCK_EMBED_PATTERN.sub('', text)).strip() or REDACTED_TEXT
+        return f"[{text}]({block_path(block, self.blocks)})"
+
+    def summary(self) -> Optional[str]:
+        if not self.cycles and not self.truncated:
+            return None
+        return f"{self.cycles} embed cycle(s) and {self.truncated} embed(s) past depth {self.max_depth} were rendered as links."
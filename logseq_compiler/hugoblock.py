@@ -39,7 +39,7 @@ def get_display_text(block: Block, blocks: Dict[int, Block], public_registry: di
     """
     Returns the display text for a block or page, redacting if private.
     """
-    is_public = public_registry.get(block.id, False) if public_registry else False
+    is_public = public_registry.get(block.id, False) if public_registry is not None else False
     if is_public:
         return truncated_title(block)
     else:
@@ -93,6 +93,39 @@ def all_ancestors(block: Block, blocks: Dict[int, Block]) -> List[Block]:
         return all_ancestors(parent, blocks) + [block]
     return [block]
 
+def block_path(block: Optional[Block], blocks: Dict[int, Block]) -> str:
+    if not block:
+        return ''
+    ancestors = all_ancestors(block, blocks)
+    return 'graph/' + '/'.join([b.path_component() for b in ancestors])
+
+UUID_PATTERN = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+
+# Parent folder of hash buckets; slugify never emits '@', so no page folder can collide with it
+HASH_BUCKET_FOLDER = '@h'
+
+def hashed_path(path: str, levels: int = 2, width: int = 2) -> str:
+    """
+    Fans uuid path components out into hash-prefix directories, e.g.
+    `graph/page/<uuid>` -> `graph/page/@h/ab/cd/<uuid>`. Slugified page names are left as is.
+    """
+    import hashlib
+    components = []
+    for component in path.split('/'):
+        if UUID_PATTERN.match(component):
+            digest = hashlib.md5(component.encode('utf-8')).hexdigest()
+            components.append(HASH_BUCKET_FOLDER)
+            components.extend(digest[i * width:(i + 1) * width] for i in range(levels))
+        components.append(component)
+    return '/'.join(components)
+
+def content_path(path: str, hashed: bool = False) -> str:
+    """
+    Where a path's content file is written, which is what templates pass to `site.GetPage`.
+    Equal to the (URL) path except in the hashed layout; the home page ('') is never hashed.
+    """
+    return hashed_path(path) if hashed and path else path
+
 def backlinks(block: Block, blocks: Dict[int, Block]) -> List[Block]:
     return [b for b in blocks.values() if block.id in b.linked_ids]
 
@@ -124,26 +157,34 @@ def readable_name_hover(block: Block) -> str:
     return 'this block has not yet been made public by the author'
 
 class HugoBlock:
-    def __init__(self, block: Block, blocks: Dict[int, Block], backlinks=None, aliases=None, links=None, sibling_index=0):
+    def __init__(self, block: Block, blocks: Dict[int, Block], backlinks=None, aliases=None, links=None, sibling_index=0, url=None, related=None, namespace_properties=None, positions=None, hashed=False):
         self.block = block
         self.blocks = blocks
+        # Front-matter page lists hold content paths (for site.GetPage); aliases and body links are URLs
+        self.hashed = hashed
         # backlinks, aliases, links are lists of block ids
-        self.backlink_paths = {bid: self.path_for(blocks[bid]) for bid in backlinks or []}
+        self.backlink_paths = {bid: self.content_path_for(blocks[bid]) for bid in backlinks or []}
         self.alias_paths = {bid: self.path_for(blocks[bid]) for bid in aliases or []}
         ns = namespace(block, blocks)
-        self.namespace_path = self.path_for(ns) if ns else None
+        self.namespace_path = self.content_path_for(ns) if ns else None
         self.link_paths = {bid: self.path_for(blocks[bid]) for bid in links or []}
         self.sibling_index = sibling_index
+        self.related_paths = [self.content_path_for(blocks[bid]) for bid in related or [] if bid in blocks]
+        self.namespace_properties = namespace_properties or {}
+        # Permalink override, for when the file is not written at its URL path
+        self.url = url
+        # Graph order of blocks, for replacing links in the same order as a scan over all blocks
+        self.positions = positions
 
 
     def is_home(self) -> bool:
         return is_home(self.block)
 
     def path_for(self, block: Optional[Block]) -> str:
-        if not block:
-            return ''
-        ancestors = all_ancestors(block, self.blocks)
-        return 'graph/' + '/'.join([b.path_component() for b in ancestors])
+        return block_path(block, self.blocks)
+
+    def content_path_for(self, block: Optional[Block]) -> str:
+        return content_path(self.path_for(block), self.hashed)
 
     def hugo_properties(self, public_registry=None) -> Dict[str, Any]:
         props = {}
@@ -158,10 +199,15 @@ class HugoBlock:
         if self.namespace_path:
             props['namespace'] = self.namespace_path
         if self.link_paths:
-            props['links'] = list(self.link_paths.values())
+            props['links'] = [content_path(path, self.hashed) for path in self.link_paths.values()]
+        if self.related_paths:
+            props['related'] = self.related_paths
+        props.update(self.namespace_properties)
         props['collapsed'] = self.block.collapsed
         props['logseq-type'] = 'page' if self.block.is_page() else 'block'
         props['weight'] = self.sibling_index + 1
+        if self.url:
+            props['url'] = self.url
         # Always add title, matching Swift logic
         title = get_display_text(self.block, self.blocks, public_registry) or "Untitled"
         props['title'] = title
@@ -189,14 +235,19 @@ class HugoBlock:
         yaml_props.update(self.hugo_properties(public_registry=public_registry))
         return yaml.safe_dump(yaml_props, sort_keys=False, allow_unicode=True)
 
-    def file(self, public_registry=None) -> str:
+    def file(self, public_registry=None, embeds=None) -> str:
         yaml_header = self.hugo_yaml(public_registry=public_registry)
         content = self.block.content or ''
         # Apply all content transformations in Hugo order
         content = update_asset_links(content)
-        content = update_links(content, self.link_paths, self.blocks, public_registry=public_registry)
+        rendered_embeds = []
+        if embeds is not None:
+            content, rendered_embeds = embeds.extract(self.block, content)
+        content = update_links(content, self.link_paths, self.blocks, public_registry=public_registry, positions=self.positions, hashed=self.hashed)
         content = update_shortcodes(content)
         content = update_block_properties(content)
+        if rendered_embeds:
+            content = embeds.fill(content, rendered_embeds)
         return f"---\n{yaml_header}---\n\n{content}\n"
 
 # --- Helpers to match Swift's link-finder.swift ---
@@ -235,16 +286,19 @@ def update_asset_links(content: str) -> str:
 
 from .link_finder import LinkFinder
 
-def update_links(content: str, link_paths: dict, blocks: dict, public_registry=None) -> str:
+def update_links(content: str, link_paths: dict, blocks: dict, public_registry=None, positions=None, hashed=False) -> str:
     """
     Replace all Logseq links (including aliased links) in content with Hugo-friendly links using LinkFinder logic.
     Mirrors the Swift logic for robust alias and link handling.
     """
     updated_content = content
-    # Iterate over all blocks to handle both page and block links
-    for b in blocks.values():
-        path = link_paths.get(b.id)
-        if not path:
+    # Only the blocks this content links to can match, so look those up instead of scanning all blocks.
+    # Replacements can overlap (a block's text may contain another link), so keep the graph order.
+    link_ids = sorted(link_paths, key=lambda bid: positions.get(bid, bid)) if positions is not None else list(link_paths)
+    for bid in link_ids:
+        path = link_paths[bid]
+        b = blocks.get(bid)
+        if b is None or not path:
             continue
         # Determine if this block is a page
         is_page = False
@@ -254,12 +308,12 @@ def update_links(content: str, link_paths: dict, blocks: dict, public_registry=N
         link_text = get_display_text(b, blocks, public_registry)
         # For pages
         if is_page:
-            for link_finder in LinkFinder.page_link_checks(b.name or b.original_name or '', path):
+            for link_finder in LinkFinder.page_link_checks(b.name or b.original_name or '', path, embed_path=content_path(path, hashed)):
                 updated_content = link_finder.make_content_hugo_friendly(updated_content, no_links=False)
         # For blocks
         else:
             block_content = getattr(b, 'content', '') or ''
-            for link_finder in LinkFinder.block_link_checks(getattr(b, 'uuid', ''), block_content, path):
+            for link_finder in LinkFinder.block_link_checks(getattr(b, 'uuid', ''), block_content, path, embed_path=content_path(path, hashed)):
                 updated_content = link_finder.make_content_hugo_friendly(updated_content, no_links=False)
     return updated_content
 
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from .block import Block
+from .hugoblock import block_path, content_path, get_display_text, slugify
+
+# Properties that control compilation rather than describe content
+UNINDEXED_PROPERTIES = {'public', 'home', 'id', 'collapsed', 'heading', 'title'}
+
+
+def property_values(value: Any) -> List[str]:
+    """
+    Flattens a property value into the index keys it should be listed under.
+    """
+    if isinstance(value, (list, tuple, set)):
+        return [str(v) for v in value if v is not None and not isinstance(v, (dict, list))]
+    if value is None or isinstance(value, dict) or value == '':
+        return []
+    return [str(value)]
+
+
+class PropertyIndex:
+    """
+    Inverted index of Logseq properties: property key -> value -> paths of public blocks/pages.
+
+    Filled while pages are exported and written as Hugo data files
+    (`data/properties/<key>.json`), so templates can list pages by property
+    with `index site.Data.properties.<key> "<value>"` instead of scanning the site.
+    """
+
+    def __init__(self) -> None:
+        self.index: Dict[str, Dict[str, List[str]]] = {}
+
+    def add(self, block: Block, path: str) -> None:
+        for key, value in (block.properties or {}).items():
+            if key in UNINDEXED_PROPERTIES:
+                continue
+            for v in property_values(value):
+                self.index.setdefault(key, {}).setdefault(v, []).append(path)
+
+    def write(self, data_folder: Path) -> int:
+        properties_folder = data_folder / 'properties'
+        if properties_folder.exists():
+            shutil.rmtree(properties_folder)
+        properties_folder.mkdir(parents=True, exist_ok=True)
+        written = {}
+        for key, values in self.index.items():
+            file_name = slugify(key) or 'property'
+            # Distinct keys can slugify to the same file name; merge them rather than overwrite
+            merged = written.setdefault(file_name, {})
+            for v, paths in values.items():
+                merged.setdefault(v, []).extend(paths)
+        for file_name, values in written.items():
+            with open(properties_folder / f'{file_name}.json', 'w', encoding='utf-8') as f:
+                json.dump(values, f, ensure_ascii=False)
+        return len(written)
+
+
+class NamespaceIndex:
+    """
+    Namespace tree over pages (`projects` -> `projects/foo` -> `projects/foo/bar`).
+
+    Depths and public descendant counts are memoized per namespace, and each
+    namespace page gets its public children as front matter, so templates never
+    scan the whole site to find them. Logseq creates intermediate namespace pages
+    without properties, so private pages are walked through, not treated as leaves.
+    """
+
+    def __init__(
+        self,
+        blocks: Mapping[int, Block],
+        namespace_children: Mapping[int, List[int]],
+        public_registry: Mapping[int, bool],
+        title_registry: Optional[Mapping[int, bool]] = None,
+        hashed: bool = False,
+    ) -> None:
+        self.blocks = blocks
+        self.namespace_children = namespace_children
+        # public_registry decides what is published; title_registry what HugoBlock titles show
+        self.public_registry = public_registry
+        self.title_registry = title_registry if title_registry is not None else public_registry
+        # Entry paths are content paths, for site.GetPage
+        self.hashed = hashed
+        self._depths: Dict[int, int] = {}
+        self._totals: Dict[int, int] = {}
+        self._children: Dict[int, List[int]] = {}
+
+    def children(self, page_id: int) -> List[int]:
+        """
+        Nearest public pages below `page_id`: its public children, and the nearest
+        public pages under each private one (`projects/foo/bar` under `projects`
+        when `projects/foo` is private).
+        """
+        if page_id in self._children:
+            return self._children[page_id]
+        children = []
+        queue = list(reversed(self.namespace_children.get(page_id, [])))
+        seen = {page_id}
+        while queue:
+            child_id = queue.pop()
+            if child_id in seen:
+                # Namespace loop
+                continue
+            seen.add(child_id)
+            if self.public_registry.get(child_id, False):
+                children.append(child_id)
+            else:
+                queue.extend(reversed(self.namespace_children.get(child_id, [])))
+        self._children[page_id] = children
+        return children
+
+    def depth(self, page_id: int) -> int:
+        """
+        Number of namespaces above `page_id`; top-level pages have depth 0.
+        """
+        chain = []
+        current = page_id
+        while current not in self._depths:
+            chain.append(current)
+            block = self.blocks.get(current)
+            parent_id = block.namespace_id if block is not None else None
+            if parent_id is None or parent_id not in self.blocks or parent_id in chain:
+                # Root of the namespace tree (or a namespace loop)
+                self._depths[current] = 0
+                chain.pop()
+                break
+            current = parent_id
+        depth = self._depths[current]
+        for page in reversed(chain):
+            depth += 1
+            self._depths[page] = depth
+        return self._depths[page_id]
+
+    def total(self, page_id: int) -> int:
+        """
+        Number of public pages anywhere below `page_id` in the namespace tree.
+        """
+        if page_id in self._totals:
+            return self._totals[page_id]
+        # Iterative post-order so deep namespace trees don't hit the recursion limit
+        stack = [(page_id, False)]
+        seen = {page_id}
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                self._totals[current] = sum(1 + self._totals.get(c, 0) for c in self.children(current))
+                continue
+            stack.append((current, True))
+            for child_id in self.children(current):
+                if child_id not in seen and child_id not in self._totals:
+                    seen.add(child_id)
+                    stack.append((child_id, False))
+        return self._totals[page_id]
+
+    def properties(self, block: Block) -> Dict[str, Any]:
+        if not block.is_page():
+            return {}
+        props: Dict[str, Any] = {}
+        depth = self.depth(block.id)
+        if depth:
+            props['namespace-depth'] = depth
+        children = self.children(block.id)
+        if children:
+            entries = [
+                {
+                    'title': get_display_text(self.blocks[child_id], self.blocks, self.title_registry),
+                    'path': content_path(block_path(self.blocks[child_id], self.blocks), self.hashed),
+                }
+                for child_id in children
+            ]
+            entries.sort(key=lambda entry: entry['title'].lower())
+            props['namespace-children'] = entries
+            props['namespace-count'] = len(children)
+            props['namespace-total'] = self.total(block.id)
+        return props
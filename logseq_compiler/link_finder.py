@@ -68,19 +68,19 @@ class LinkFinder:
         self.path = path
 
     @staticmethod
-    def page_link_checks(name: str, path: str) -> List['LinkFinder']:
-        # Order matters
+    def page_link_checks(name: str, path: str, embed_path: Optional[str] = None) -> List['LinkFinder']:
+        # Order matters; embed shortcodes look the page up by its content path, links use its URL path
         return [
-            LinkFinder(LinkFinder.PAGE_EMBED, name=name, path=path),
+            LinkFinder(LinkFinder.PAGE_EMBED, name=name, path=embed_path or path),
             LinkFinder(LinkFinder.PAGE_ALIAS, name=name, path=path),
             LinkFinder(LinkFinder.PAGE_REFERENCE, name=name, path=path),
         ]
 
     @staticmethod
-    def block_link_checks(uuid: str, content: str, path: str) -> List['LinkFinder']:
-        # Order matters
+    def block_link_checks(uuid: str, content: str, path: str, embed_path: Optional[str] = None) -> List['LinkFinder']:
+        # Order matters; embed shortcodes look the block up by its content path, links use its URL path
         return [
-            LinkFinder(LinkFinder.BLOCK_EMBED, uuid=uuid, content=content, path=path),
+            LinkFinder(LinkFinder.BLOCK_EMBED, uuid=uuid, content=content, path=embed_path or path),
             LinkFinder(LinkFinder.BLOCK_ALIAS, uuid=uuid, content=content, path=path),
             LinkFinder(LinkFinder.BLOCK_REFERENCE, uuid=uuid, content=content, path=path),
         ]
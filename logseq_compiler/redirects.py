@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+REDIRECT_FORMATS = ('netlify', 'apache', 'nginx', 'json')
+
+
+def url_for(path: str) -> str:
+    """
+    Site URL for an exported path, e.g. `graph/page` -> `/graph/page/`.
+    """
+    path = path.strip('/')
+    return f"/{path}/" if path else '/'
+
+
+class RedirectMap:
+    """
+    Collects alias -> target redirects for all public pages during export, so they
+    can be written as a single redirect file instead of per-page `aliases` front
+    matter (which makes Hugo write one HTML redirect file per alias).
+
+    An alias claimed by two targets, or one that shadows a published page, is a
+    conflict: it is reported and only the first target (if any) is kept.
+    """
+
+    def __init__(self) -> None:
+        self.redirects: Dict[str, str] = {}
+        self.page_urls: Set[str] = set()
+        self.conflicts: List[Tuple[str, str, str]] = []
+
+    def add_page(self, path: str) -> None:
+        self.page_urls.add(url_for(path))
+
+    def add(self, alias_paths: Iterable[str], target_path: str) -> None:
+        target = url_for(target_path)
+        for alias_path in alias_paths:
+            alias = url_for(alias_path)
+            if alias == target:
+                continue
+            existing = self.redirects.get(alias)
+            if existing is None:
+                self.redirects[alias] = target
+            elif existing != target:
+                self.conflicts.append((alias, existing, target))
+
+    def resolve(self) -> Dict[str, str]:
+        """
+        Final redirect map, with aliases that would shadow a published page dropped.
+        """
+        resolved = {}
+        for alias, target in self.redirects.items():
+            if alias in self.page_urls:
+                self.conflicts.append((alias, '(published page)', target))
+                continue
+            resolved[alias] = target
+        return resolved
+
+    def write(self, file_path: Path, redirect_format: str = 'netlify') -> int:
+        if redirect_format not in REDIRECT_FORMATS:
+            raise ValueError(f"Unknown redirect format '{redirect_format}', expected one of: {', '.join(REDIRECT_FORMATS)}")
+        redirects = self.resolve()
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            if redirect_format == 'json':
+                json.dump(redirects, f, ensure_ascii=False, indent=0)
+            else:
+                for alias, target in redirects.items():
+                    if redirect_format == 'netlify':
+                        f.write(f"{alias} {target} 301\n")
+                    elif redirect_format == 'apache':
+                        # `Redirect` matches by prefix and would also catch the public blocks under an alias page
+                        f.write(f"RedirectMatch 301 ^{re.escape(alias.rstrip('/'))}/?$ {target}\n")
+                    elif redirect_format == 'nginx':
+                        f.write(f"{alias} {target};\n")
+        return len(redirects)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, List, Mapping, Set
+
+from .block import Block
+
+
+def page_of(block: Block) -> int:
+    return block.id if block.is_page() else (block.page_id or block.id)
+
+
+def related_pages(
+    blocks: Mapping[int, Block],
+    public_registry: Mapping[int, bool],
+    top_k: int = 5,
+    max_df: int = 1000,
+) -> Dict[int, List[int]]:
+    """
+    Computes the top-K related public pages for every public page.
+
+    Pages are compared on the sparse page -> referenced-page matrix built from
+    the refs (`inherited_linked_ids`) of public blocks:
+    - shared refs: both pages reference the same page;
+    - co-citation: both pages are referenced from the same page.
+    Each shared feature is weighted by 1/log(1 + document frequency), and
+    features referenced by more than `max_df` pages (hubs such as journals)
+    are skipped, so the pairwise work stays linear in the number of refs.
+    """
+    # Sparse rows: citing page -> referenced pages (public content only)
+    refs: Dict[int, Set[int]] = {}
+    for block in blocks.values():
+        if not public_registry.get(block.id, False):
+            continue
+        source = page_of(block)
+        for ref_id in block.inherited_linked_ids:
+            target = blocks.get(ref_id)
+            if target is None:
+                continue
+            target_page = page_of(target)
+            if target_page != source:
+                refs.setdefault(source, set()).add(target_page)
+
+    def is_public_page(page_id: int) -> bool:
+        block = blocks.get(page_id)
+        return block is not None and block.is_page() and public_registry.get(page_id, False)
+
+    public_pages = {page_id for page_id in set(refs) | {r for targets in refs.values() for r in targets} if is_public_page(page_id)}
+
+    # Postings (columns of the matrix and of its transpose), restricted to public pages
+    cited_by: Dict[int, List[int]] = {}  # referenced page -> public citing pages
+    for source, targets in refs.items():
+        if source not in public_pages:
+            continue
+        for target in targets:
+            cited_by.setdefault(target, []).append(source)
+    cites: Dict[int, List[int]] = {
+        source: [t for t in targets if t in public_pages] for source, targets in refs.items()
+    }
+
+    def weight(df: int) -> float:
+        return 1.0 / math.log(1 + df)
+
+    related: Dict[int, List[int]] = {}
+    for page_id in public_pages:
+        scores: Dict[int, float] = {}
+        # Shared refs: other public pages citing what this page cites
+        for target in refs.get(page_id, ()):
+            postings = cited_by.get(target, [])
+            if len(postings) > max_df:
+                continue
+            w = weight(len(postings))
+            for other in postings:
+                scores[other] = scores.get(other, 0.0) + w
+        # Co-citation: other public pages cited by pages that cite this page
+        for source in cited_by.get(page_id, ()):
+            postings = cites.get(source, [])
+            if len(postings) > max_df:
+                continue
+            w = weight(len(postings))
+            for other in postings:
+                scores[other] = scores.get(other, 0.0) + w
+        scores.pop(page_id, None)
+        if scores:
+            top = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+            related[page_id] = [other for other, _ in top]
+    return related
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections import OrderedDict, namedtuple
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from .block import Block, order_siblings
+from .hugoblock import slugify
+
+_SiblingRow = namedtuple('_SiblingRow', 'id left_id')
+
+SCHEMA = """
+DROP TABLE IF EXISTS blocks;
+DROP TABLE IF EXISTS refs;
+DROP TABLE IF EXISTS paths;
+DROP TABLE IF EXISTS visibility;
+DROP TABLE IF EXISTS siblings;
+CREATE TABLE blocks (
+    id INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    uuid TEXT NOT NULL,
+    parent_id INTEGER,
+    left_id INTEGER,
+    name TEXT,
+    original_name TEXT,
+    is_page INTEGER NOT NULL,
+    showable INTEGER NOT NULL,
+    public_prop INTEGER,
+    data TEXT NOT NULL
+);
+CREATE TABLE refs (
+    src INTEGER NOT NULL,
+    dst INTEGER NOT NULL,
+    kind TEXT NOT NULL
+);
+CREATE TABLE paths (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL
+);
+CREATE TABLE visibility (
+    id INTEGER PRIMARY KEY,
+    public INTEGER NOT NULL,
+    public_assumed INTEGER NOT NULL
+);
+CREATE TABLE siblings (
+    id INTEGER PRIMARY KEY,
+    sibling_index INTEGER NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS blocks_parent ON blocks (parent_id);
+CREATE INDEX IF NOT EXISTS blocks_seq ON blocks (seq);
+CREATE INDEX IF NOT EXISTS refs_src ON refs (kind, src);
+CREATE INDEX IF NOT EXISTS refs_dst ON refs (kind, dst);
+"""
+
+REF_LINK = 'link'
+REF_ALIAS = 'alias'
+REF_NAMESPACE = 'namespace'
+
+
+def public_flag(properties: Dict[str, Any]) -> Optional[bool]:
+    """
+    Returns the explicit `public::` value of a block, or None if it does not set one.
+    """
+    if 'public' not in properties:
+        return None
+    val = properties['public']
+    if isinstance(val, bool):
+        return val
+    return str(val).lower() == 'true'
+
+
+def iter_json_array(json_path: Path, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yields the elements of a top-level JSON array one at a time without loading the whole file.
+    """
+    decoder = json.JSONDecoder()
+    with open(json_path, 'r', encoding='utf-8') as f:
+        buf = f.read(chunk_size)
+        pos = len(buf) - len(buf.lstrip())
+        if pos >= len(buf) or buf[pos] != '[':
+            raise ValueError('Graph JSON must be a list of blocks')
+        pos += 1
+        eof = False
+        while True:
+            while pos < len(buf) and (buf[pos].isspace() or buf[pos] == ','):
+                pos += 1
+            if pos < len(buf) and buf[pos] == ']':
+                return
+            try:
+                if pos >= len(buf):
+                    raise json.JSONDecodeError('Unexpected end of data', buf, pos)
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(chunk_size)
+                eof = not more
+                buf = buf[pos:] + more
+                pos = 0
+                continue
+            yield obj
+
+
+class _StoreView(Mapping):
+    """
+    Read-only, dict-like view over one of the store's tables, keyed by block id.
+    """
+
+    def __init__(self, store: GraphStore) -> None:
+        self.store = store
+
+    def __iter__(self) -> Iterator[int]:
+        for (block_id,) in self.store.conn.execute('SELECT id FROM blocks ORDER BY seq'):
+            yield block_id
+
+    def __len__(self) -> int:
+        return self.store.conn.execute('SELECT COUNT(*) FROM blocks').fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return True
+
+
+class _BlockView(_StoreView):
+    def __getitem__(self, block_id: int) -> Block:
+        block = self.store.block(block_id)
+        if block is None:
+            raise KeyError(block_id)
+        return block
+
+    def __contains__(self, block_id: object) -> bool:
+        return self.store.has_block(block_id)
+
+    def values(self) -> Iterator[Block]:
+        for (data,) in self.store.conn.execute('SELECT data FROM blocks ORDER BY seq'):
+            yield Block(**json.loads(data))
+
+
+class _RefView(_StoreView):
+    def __init__(self, store: GraphStore, kind: str, reverse: bool = False) -> None:
+        super().__init__(store)
+        key, value = ('dst', 'src') if reverse else ('src', 'dst')
+        self.query = f'SELECT {value} FROM refs WHERE kind = ? AND {key} = ? ORDER BY rowid'
+        self.kind = kind
+
+    def __getitem__(self, block_id: int) -> List[int]:
+        if not self.store.has_block(block_id):
+            raise KeyError(block_id)
+        return [row[0] for row in self.store.conn.execute(self.query, (self.kind, block_id))]
+
+
+class _ColumnView(_StoreView):
+    def __init__(self, store: GraphStore, table: str, column: str) -> None:
+        super().__init__(store)
+        self.table = table
+        self.query = f'SELECT {column} FROM {table} WHERE id = ?'
+
+    def __getitem__(self, block_id: int) -> Any:
+        row = self.store.conn.execute(self.query, (block_id,)).fetchone()
+        if row is None:
+            raise KeyError(block_id)
+        return row[0]
+
+    def __iter__(self) -> Iterator[int]:
+        for (block_id,) in self.store.conn.execute(f'SELECT id FROM {self.table}'):
+            yield block_id
+
+    def __len__(self) -> int:
+        return self.store.conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+
+class _VisibilityView(_ColumnView):
+    def __getitem__(self, block_id: int) -> bool:
+        return bool(super().__getitem__(block_id))
+
+
+class GraphStore:
+    """
+    Disk-backed graph storage for graphs that don't fit in memory.
+
+    Blocks, refs, paths and visibility live in an indexed SQLite database; the
+    attributes below expose them through the same dict-like interface as the
+    in-memory maps on `Graph`, with an LRU cache in front of block lookups.
+    """
+
+    def __init__(self, db_path: Path, cache_size: int = 10000) -> None:
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+        self.conn = sqlite3.connect(str(db_path))
+        self.blocks = _BlockView(self)
+        self.links_map = _RefView(self, REF_LINK)
+        self.backlinks_map = _RefView(self, REF_LINK, reverse=True)
+        self.aliases_map = _RefView(self, REF_ALIAS)
+        self.namespace_children = _RefView(self, REF_NAMESPACE, reverse=True)
+        self.sibling_index_map = _ColumnView(self, 'siblings', 'sibling_index')
+        self.block_paths = _ColumnView(self, 'paths', 'path')
+        # Position in the graph JSON, which is the order the in-memory backend iterates blocks in
+        self.block_positions = _ColumnView(self, 'blocks', 'seq')
+        self.public_registry = _VisibilityView(self, 'visibility', 'public')
+        self.assumed_public_registry = _VisibilityView(self, 'visibility', 'public_assumed')
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def has_block(self, block_id: Any) -> bool:
+        # Existence check on the primary key, without decoding the block or touching the cache
+        if block_id in self._cache:
+            return True
+        return self.conn.execute('SELECT 1 FROM blocks WHERE id = ?', (block_id,)).fetchone() is not None
+
+    def block(self, block_id: Any) -> Optional[Block]:
+        if block_id in self._cache:
+            self._cache.move_to_end(block_id)
+            return self._cache[block_id]
+        row = self.conn.execute('SELECT data FROM blocks WHERE id = ?', (block_id,)).fetchone()
+        if row is None:
+            return None
+        block = Block(**json.loads(row[0]))
+        self._cache[block_id] = block
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return block
+
+    def children(self, block_id: Optional[int]) -> List[int]:
+        if block_id is None:
+            rows = self.conn.execute('SELECT id FROM blocks WHERE parent_id IS NULL')
+        else:
+            rows = self.conn.execute('SELECT id FROM blocks WHERE parent_id = ?', (block_id,))
+        return [row[0] for row in rows]
+
+    def registry(self, assume_public: bool = False) -> Mapping[int, bool]:
+        return self.assumed_public_registry if assume_public else self.public_registry
+
+    def count_publishable(self, assume_public: bool = False) -> int:
+        column = 'public_assumed' if assume_public else 'public'
+        return self.conn.execute(
+            f'SELECT COUNT(*) FROM blocks b JOIN visibility v ON v.id = b.id WHERE b.showable = 1 AND v.{column} = 1'
+        ).fetchone()[0]
+
+    def publishable_ids(self, assume_public: bool = False) -> Iterator[int]:
+        column = 'public_assumed' if assume_public else 'public'
+        cursor = self.conn.execute(
+            f'SELECT b.id FROM blocks b JOIN visibility v ON v.id = b.id WHERE b.showable = 1 AND v.{column} = 1 ORDER BY b.seq'
+        )
+        for (block_id,) in cursor:
+            yield block_id
+
+    # --- Ingest ---
+
+    def ingest(self, json_path: Path, batch_size: int = 5000) -> None:
+        print(f"[logseq-compiler] [store] Ingesting {json_path} into {self.db_path}...")
+        t0 = time.time()
+        self._cache.clear()
+        self.conn.executescript(SCHEMA)
+        block_rows = []
+        ref_rows = []
+        count = 0
+        for block_json in iter_json_array(json_path):
+            if 'db/id' not in block_json or 'block/uuid' not in block_json:
+                continue
+            block = Block.from_json(block_json)
+            block_rows.append((
+                block.id, count, block.uuid, block.parent_id, block.left_id, block.name, block.original_name,
+                int(block.is_page()), int(block.showable()), public_flag(block.properties),
+                json.dumps(asdict(block)),
+            ))
+            ref_rows.extend((block.id, linked_id, REF_LINK) for linked_id in block.linked_ids)
+            ref_rows.extend((block.id, alias_id, REF_ALIAS) for alias_id in block.alias_ids)
+            if block.namespace_id is not None:
+                ref_rows.append((block.id, block.namespace_id, REF_NAMESPACE))
+            count += 1
+            if len(block_rows) >= batch_size:
+                self._flush(block_rows, ref_rows)
+            if count % 10000 == 0:
+                print(f"[logseq-compiler] [store] Ingested {count} blocks...")
+        self._flush(block_rows, ref_rows)
+        self.conn.executescript(INDEXES)
+        # Refs to blocks outside the graph are dropped, as in the in-memory maps
+        self.conn.execute('DELETE FROM refs WHERE dst NOT IN (SELECT id FROM blocks)')
+        self.conn.commit()
+        print(f"[logseq-compiler] [store] {count} valid blocks ingested. Time elapsed: {time.time() - t0:.2f}s")
+        self._compute_sibling_indices(batch_size)
+        self._compute_visibility_and_paths(batch_size)
+
+    def _flush(self, block_rows: List[tuple], ref_rows: List[tuple]) -> None:
+        self.conn.executemany('INSERT OR REPLACE INTO blocks (id, seq, uuid, parent_id, left_id, name, original_name, is_page, showable, public_prop, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', block_rows)
+        self.conn.executemany('INSERT INTO refs (src, dst, kind) VALUES (?, ?, ?)', ref_rows)
+        block_rows.clear()
+        ref_rows.clear()
+
+    def _compute_sibling_indices(self, batch_size: int) -> None:
+        print("[logseq-compiler] [store] Computing sibling indices...")
+        t0 = time.time()
+        rows = []
+        siblings: List[_SiblingRow] = []
+        current_parent: Any = object()
+        # Rows are grouped by parent so only one sibling group is held at a time
+        cursor = self.conn.execute('SELECT id, parent_id, left_id FROM blocks ORDER BY parent_id, seq')
+        for block_id, parent_id, left_id in cursor:
+            if parent_id != current_parent:
+                rows.extend(order_siblings(siblings).items())
+                siblings = []
+                current_parent = parent_id
+                if len(rows) >= batch_size:
+                    self.conn.executemany('INSERT OR REPLACE INTO siblings (id, sibling_index) VALUES (?, ?)', rows)
+                    rows.clear()
+            siblings.append(_SiblingRow(block_id, left_id))
+        rows.extend(order_siblings(siblings).items())
+        self.conn.executemany('INSERT OR REPLACE INTO siblings (id, sibling_index) VALUES (?, ?)', rows)
+        self.conn.commit()
+        print(f"[logseq-compiler] [store] Done computing sibling indices. Time elapsed: {time.time() - t0:.2f}s")
+
+    def _compute_visibility_and_paths(self, batch_size: int) -> None:
+        print("[logseq-compiler] [store] Computing public status and block paths (DFS over index)...")
+        t0 = time.time()
+        notes_folder = "graph/"
+        visibility_rows = []
+        path_rows = []
+        query = 'SELECT id, uuid, name, original_name, is_page, public_prop FROM blocks WHERE parent_id {}'
+        # Stack entries: (row, parent_public, parent_public_assumed, parent_path)
+        stack = [(row, None, True, None) for row in self.conn.execute(query.format('IS NULL')).fetchall()]
+        checked_count = 0
+        while stack:
+            (block_id, uuid, name, original_name, is_page, public_prop), parent_public, parent_assumed, parent_path = stack.pop()
+            if public_prop is not None:
+                effective = bool(public_prop)
+                effective_assumed = bool(public_prop)
+            else:
+                effective = bool(parent_public)
+                effective_assumed = parent_assumed
+            if is_page and effective:
+                component = slugify(name or original_name or str(block_id))
+            else:
+                component = uuid
+            path = f"{parent_path}/{component}" if parent_path else notes_folder + component
+            visibility_rows.append((block_id, int(effective), int(effective_assumed)))
+            path_rows.append((block_id, path))
+            if len(visibility_rows) >= batch_size:
+                self._flush_visibility(visibility_rows, path_rows)
+            checked_count += 1
+            if checked_count % 10000 == 0:
+                print(f"[logseq-compiler] [store] Checked {checked_count} blocks...")
+            for child in self.conn.execute(query.format('= ?'), (block_id,)).fetchall():
+                stack.append((child, effective, effective_assumed, path))
+        self._flush_visibility(visibility_rows, path_rows)
+        self.conn.commit()
+        print(f"[logseq-compiler] [store] Done computing public status and paths. Time elapsed: {time.time() - t0:.2f}s")
+
+    def _flush_visibility(self, visibility_rows: List[tuple], path_rows: List[tuple]) -> None:
+        self.conn.executemany('INSERT OR REPLACE INTO visibility (id, public, public_assumed) VALUES (?, ?, ?)', visibility_rows)
+        self.conn.executemany('INSERT OR REPLACE INTO paths (id, path) VALUES (?, ?)', path_rows)
+        visibility_rows.clear()
+        path_rows.clear()
@@ -0,0 +1,165 @@
+"""
+Random Logseq graphs and export helpers shared by the tests.
+"""
+import contextlib
+import filecmp
+import io
+import json
+import uuid
+from pathlib import Path
+
+from logseq_compiler.compiler import Graph
+
+
+def make_uuid(block_id):
+    return str(uuid.UUID(int=block_id))
+
+
+def random_graph(rnd):
+    """
+    A small graph with namespaces, aliases, mixed visibility, block refs and embeds.
+    """
+    blocks = []
+    pages = []
+    next_id = 1
+    for p in range(rnd.randint(6, 12)):
+        name = rnd.choice([f"p{p}", f"p{p}", f"ns/p{p}", f"ns/sub/p{p}"])
+        props = {'public': True} if rnd.random() < 0.6 else rnd.choice([{}, {'public': False}])
+        if rnd.random() < 0.3:
+            props['tags'] = rnd.choice(['alpha', ['alpha', 'beta']])
+        if p == 0:
+            props['home'] = True
+        pages.append(next_id)
+        blocks.append({'db/id': next_id, 'block/uuid': make_uuid(next_id), 'block/name': name, 'block/original-name': name, 'block/properties': props})
+        next_id += 1
+    names = {b['db/id']: b['block/name'] for b in blocks}
+    contents = []
+    for page_id in list(pages):
+        parents = [page_id]
+        lefts = {}
+        for _ in range(rnd.randint(1, 5)):
+            parent_id = rnd.choice(parents)
+            text = f"text{next_id}"
+            refs = []
+            for _ in range(rnd.randint(0, 3)):
+                kind = rnd.random()
+                if kind < 0.5 or not contents:
+                    target = rnd.choice(pages)
+                    text += f" [[{names[target]}]]"
+                elif kind < 0.8:
+                    target = rnd.choice(contents)
+                    text += f" (({make_uuid(target)}))"
+                else:
+                    target = rnd.choice(contents)
+                    text += f"\n{{{{embed (({make_uuid(target)}))}}}}"
+                refs.append(target)
+            props = rnd.choice([{}, {}, {}, {'public': False}, {'status': 'done'}])
+            blocks.append({
+                'db/id': next_id, 'block/uuid': make_uuid(next_id), 'block/content': text,
+                'block/page': {'db/id': page_id}, 'block/parent': {'db/id': parent_id},
+                'block/left': {'db/id': lefts.get(parent_id, parent_id)},
+                'block/refs': [{'db/id': r} for r in refs], 'block/path-refs': [{'db/id': r} for r in refs],
+                'block/properties': props,
+            })
+            lefts[parent_id] = next_id
+            contents.append(next_id)
+            parents.append(next_id)
+            next_id += 1
+    # Namespace pages for every prefix, then each namespaced page points at its parent
+    by_name = {name: block_id for block_id, name in names.items()}
+    for name in list(names.values()):
+        parts = name.split('/')
+        for i in range(1, len(parts)):
+            prefix = '/'.join(parts[:i])
+            if prefix not in by_name:
+                by_name[prefix] = next_id
+                blocks.append({'db/id': next_id, 'block/uuid': make_uuid(next_id), 'block/name': prefix, 'block/original-name': prefix, 'block/properties': {'public': True}})
+                next_id += 1
+    for block in blocks:
+        name = block.get('block/name')
+        if name and '/' in name:
+            block['block/namespace'] = {'db/id': by_name[name.rsplit('/', 1)[0]]}
+        if name and rnd.random() < 0.15:
+            block['block/alias'] = [{'db/id': rnd.choice(pages)}]
+    return blocks
+
+
+def mutate(blocks, rnd):
+    """
+    Applies a few random edits: content, renames, namespace moves, visibility flips, deletes, adds, moves and aliases.
+    """
+    blocks = json.loads(json.dumps(blocks))
+    pages = [b for b in blocks if 'block/name' in b]
+    contents = [b for b in blocks if 'block/content' in b]
+    next_id = max(b['db/id'] for b in blocks) + 1
+    for _ in range(rnd.randint(1, 4)):
+        op = rnd.choice(['edit', 'rename', 'namespace', 'page-visibility', 'block-visibility', 'delete', 'add', 'move', 'alias'])
+        page = rnd.choice(pages)
+        block = rnd.choice(contents) if contents else None
+        if op == 'edit' and block:
+            block['block/content'] += ' edited'
+        elif op == 'rename':
+            page['block/name'] += 'x'
+            page['block/original-name'] = page['block/name']
+        elif op == 'namespace' and '/' in page['block/name']:
+            target = rnd.choice(pages)
+            page['block/name'] = f"{target['block/name']}/{page['block/name'].rsplit('/', 1)[1]}"
+            page['block/original-name'] = page['block/name']
+            page['block/namespace'] = {'db/id': target['db/id']}
+        elif op == 'page-visibility':
+            page['block/properties'] = dict(page['block/properties'], public=not page['block/properties'].get('public', False))
+        elif op == 'block-visibility' and block:
+            props = dict(block['block/properties'])
+            if props.pop('public', None) is None:
+                props['public'] = rnd.choice([True, False])
+            block['block/properties'] = props
+        elif op == 'delete':
+            parent_ids = {(b.get('block/parent') or {}).get('db/id') for b in blocks}
+            leaves = [b for b in contents if b['db/id'] not in parent_ids]
+            if leaves:
+                victim = rnd.choice(leaves)
+                blocks.remove(victim)
+                contents.remove(victim)
+                for b in blocks:
+                    if (b.get('block/left') or {}).get('db/id') == victim['db/id']:
+                        b['block/left'] = victim['block/left']
+        elif op == 'add':
+            target = rnd.choice(pages)
+            new = {
+                'db/id': next_id, 'block/uuid': make_uuid(next_id), 'block/content': f"new{next_id} [[{target['block/name']}]]",
+                'block/page': {'db/id': page['db/id']}, 'block/parent': {'db/id': page['db/id']}, 'block/left': {'db/id': page['db/id']},
+                'block/refs': [{'db/id': target['db/id']}], 'block/path-refs': [{'db/id': target['db/id']}],
+                'block/properties': rnd.choice([{}, {'public': False}]),
+            }
+            blocks.insert(rnd.randrange(len(blocks) + 1), new)
+            contents.append(new)
+            next_id += 1
+        elif op == 'move' and block:
+            block['block/left'] = {'db/id': block['block/parent']['db/id']}
+        elif op == 'alias':
+            if page.pop('block/alias', None) is None:
+                page['block/alias'] = [{'db/id': rnd.choice(pages)['db/id']}]
+    return blocks
+
+
+def same_tree(left, right):
+    comparison = filecmp.dircmp(left, right)
+    if comparison.left_only or comparison.right_only:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(left, right, comparison.common_files, shallow=False)
+    if mismatch or errors:
+        return False
+    return all(same_tree(Path(left) / d, Path(right) / d) for d in comparison.common_dirs)
+
+
+def export(json_path, destination, graph_options=None, **flags):
+    """
+    Runs a quiet export of `json_path` into `destination`; `graph_options` go to Graph, `flags` to export_for_hugo.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        graph = Graph(json_path, destination.parent / 'assets', destination, **(graph_options or {}))
+        try:
+            return graph.export_for_hugo(**flags)
+        finally:
+            if graph.store is not None:
+                graph.store.close()
@@ -0,0 +1,47 @@
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from graphs import export, mutate, random_graph, same_tree
+
+
+class DeltaExportTest(unittest.TestCase):
+    """
+    A delta export (`since=`) on top of the old graph's export must equal a full export of the new graph.
+    """
+
+    FLAG_SETS = [
+        {},
+        {'assume_public': True},
+        {'namespace_index': True, 'related_count': 3},
+        {'inline_embeds': True, 'layout': 'hashed'},
+        {'inline_embeds': True, 'assume_public': True, 'namespace_index': True},
+    ]
+
+    def test_delta_matches_full_export(self):
+        for seed in range(16):
+            for flags in self.FLAG_SETS:
+                with self.subTest(seed=seed, flags=flags), tempfile.TemporaryDirectory() as tmp:
+                    tmp = Path(tmp)
+                    rnd = random.Random(seed)
+                    old_blocks = random_graph(rnd)
+                    new_blocks = mutate(old_blocks, rnd)
+                    # Exports list blocks in no particular order, and the order decides ties such as backlink order
+                    rnd.shuffle(new_blocks)
+                    old_json, new_json = tmp / 'old.json', tmp / 'new.json'
+                    old_json.write_text(json.dumps(old_blocks))
+                    new_json.write_text(json.dumps(new_blocks))
+                    (tmp / 'assets').mkdir()
+                    delta, full = tmp / 'delta', tmp / 'full'
+                    delta.mkdir()
+                    full.mkdir()
+                    export(old_json, delta, **flags)
+                    export(new_json, delta, since=old_json, **flags)
+                    export(new_json, full, **flags)
+                    self.assertTrue(same_tree(delta, full))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from graphs import export, make_uuid
+
+
+def page(block_id, name, properties=None):
+    return {'db/id': block_id, 'block/uuid': make_uuid(block_id), 'block/name': name, 'block/original-name': name, 'block/properties': properties or {}}
+
+
+def block(block_id, page_id, parent_id, left_id, content, refs=()):
+    return {
+        'db/id': block_id, 'block/uuid': make_uuid(block_id), 'block/content': content,
+        'block/page': {'db/id': page_id}, 'block/parent': {'db/id': parent_id}, 'block/left': {'db/id': left_id},
+        'block/refs': [{'db/id': r} for r in refs], 'block/path-refs': [{'db/id': r} for r in refs],
+    }
+
+
+def embed(block_id):
+    return f"{{{{embed (({make_uuid(block_id)}))}}}}"
+
+
+GRAPH = [
+    page(1, 'a', {'public': True}),
+    block(10, 1, 1, 1, 'target'),
+    block(11, 1, 10, 10, 'child'),
+    block(12, 1, 1, 10, f"before {embed(10)} after", [10]),
+    # 13 and 14 embed each other
+    block(13, 1, 1, 12, f"x {embed(14)}", [14]),
+    block(14, 1, 1, 13, f"y {embed(13)}", [13]),
+    # 20 -> 21 -> 22 -> 23, one level deeper than the depth limit
+    block(20, 1, 1, 14, f"d0 {embed(21)}", [21]),
+    block(21, 1, 1, 20, f"d1 {embed(22)}", [22]),
+    block(22, 1, 1, 21, f"d2 {embed(23)}", [23]),
+    block(23, 1, 1, 22, 'd3'),
+]
+
+
+class InlineEmbedsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        tmp = Path(cls.tmp.name)
+        json_path = tmp / 'graph.json'
+        json_path.write_text(json.dumps(GRAPH))
+        (tmp / 'assets').mkdir()
+        cls.destination = tmp / 'content'
+        cls.destination.mkdir()
+        export(json_path, cls.destination, inline_embeds=True, embed_depth=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def body(self, block_id):
+        text = (self.destination / 'graph' / 'a' / make_uuid(block_id) / '_index.md').read_text()
+        return text.split('---\n', 2)[2].strip('\n')
+
+    def test_embed_renders_subtree(self):
+        self.assertIn('- target\n  - child', self.body(12))
+
+    def test_text_after_embed_stays_out_of_the_subtree(self):
+        self.assertEqual(self.body(12), 'before \n- target\n  - child\n\nafter')
+
+    def test_cycle_becomes_link(self):
+        body = self.body(13)
+        # 14 is inlined once; its embed of 13 (already on the chain) is a link back
+        self.assertEqual(body.count('- y'), 1)
+        self.assertIn(f"](graph/a/{make_uuid(13)})", body)
+        self.assertNotIn('{{embed', body)
+
+    def test_depth_limit_becomes_link(self):
+        body = self.body(20)
+        self.assertIn('- d1', body)
+        self.assertIn('- d2', body)
+        self.assertIn(f"[d3](graph/a/{make_uuid(23)})", body)
+        self.assertNotIn('- d3', body)
+
+
+if __name__ == '__main__':
+    unittest.main()
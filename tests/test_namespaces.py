@@ -0,0 +1,74 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from graphs import export, make_uuid
+
+
+def page(page_id, name, public=None, namespace_id=None):
+    block = {
+        'db/id': page_id, 'block/uuid': make_uuid(page_id), 'block/name': name, 'block/original-name': name,
+        'block/properties': {} if public is None else {'public': public},
+    }
+    if namespace_id is not None:
+        block['block/namespace'] = {'db/id': namespace_id}
+    return block
+
+
+# projects/foo and projects/foo/baz are the private pages Logseq creates for their children
+GRAPH = [
+    page(1, 'projects', True),
+    page(2, 'projects/foo', None, 1),
+    page(3, 'projects/foo/bar', True, 2),
+    page(4, 'projects/foo/baz', None, 2),
+    page(5, 'projects/foo/baz/qux', True, 4),
+    page(6, 'projects/foo/quux', None, 2),
+    page(7, 'projects/top', True, 1),
+    # Two private levels that only the deepest page sits in
+    page(8, 'projects/deep', None, 1),
+    page(9, 'projects/deep/er', None, 8),
+    page(10, 'projects/deep/er/est', True, 9),
+]
+
+
+class NamespaceIndexTest(unittest.TestCase):
+    """
+    Private intermediate namespace pages must not cut their public descendants off the namespace tree.
+    """
+
+    GRAPH_OPTIONS = [
+        {},
+        {'prune_private': True},
+        {'store_path': 'graph.db'},
+    ]
+
+    def front_matter(self, destination, slug):
+        text = (destination / 'graph' / slug / '_index.md').read_text()
+        return text.split('---\n', 2)[1]
+
+    def test_private_intermediates_are_walked_through(self):
+        for options in self.GRAPH_OPTIONS:
+            with self.subTest(options=options), tempfile.TemporaryDirectory() as tmp:
+                tmp = Path(tmp)
+                json_path = tmp / 'graph.json'
+                json_path.write_text(json.dumps(GRAPH))
+                (tmp / 'assets').mkdir()
+                destination = tmp / 'content'
+                destination.mkdir()
+                if 'store_path' in options:
+                    options = {**options, 'store_path': tmp / options['store_path']}
+                export(json_path, destination, graph_options=options, namespace_index=True)
+                projects = self.front_matter(destination, 'projects')
+                self.assertIn('path: graph/projects-foo-bar\n', projects)
+                self.assertIn('path: graph/projects-foo-baz-qux\n', projects)
+                self.assertIn('path: graph/projects-top\n', projects)
+                self.assertIn('path: graph/projects-deep-er-est\n', projects)
+                self.assertIn('namespace-count: 4\n', projects)
+                self.assertIn('namespace-total: 4\n', projects)
+                self.assertNotIn('projects-foo\n', projects)
+                self.assertIn('namespace-depth: 3\n', self.front_matter(destination, 'projects-foo-baz-qux'))
+
+
+if __name__ == '__main__':
+    unittest.main()
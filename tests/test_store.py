@@ -0,0 +1,44 @@
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from graphs import export, random_graph, same_tree
+
+
+class StoreParityTest(unittest.TestCase):
+    """
+    Exporting through the SQLite store must write the same tree as the in-memory backend.
+    """
+
+    FLAG_SETS = [
+        {},
+        {'assume_public': True},
+        {'inline_embeds': True, 'namespace_index': True, 'related_count': 3},
+    ]
+
+    def test_store_matches_memory(self):
+        for seed in range(12):
+            for shuffled in (False, True):
+                for flags in self.FLAG_SETS:
+                    with self.subTest(seed=seed, shuffled=shuffled, flags=flags), tempfile.TemporaryDirectory() as tmp:
+                        tmp = Path(tmp)
+                        rnd = random.Random(seed)
+                        blocks = random_graph(rnd)
+                        if shuffled:
+                            # Exports list blocks in no particular order; ties must still break the same way
+                            rnd.shuffle(blocks)
+                        json_path = tmp / 'graph.json'
+                        json_path.write_text(json.dumps(blocks))
+                        (tmp / 'assets').mkdir()
+                        memory, store = tmp / 'memory', tmp / 'store'
+                        memory.mkdir()
+                        store.mkdir()
+                        export(json_path, memory, **flags)
+                        export(json_path, store, graph_options={'store_path': tmp / 'graph.db', 'cache_size': 8}, **flags)
+                        self.assertTrue(same_tree(memory, store))
+
+
+if __name__ == '__main__':
+    unittest.main()